@@ -4,6 +4,8 @@ from datetime import datetime
 
 from typing import Callable, TypeVar, Any
 
+from memoization import memoization_scope
+
 FunctionCore = TypeVar("FunctionCore", bound=Callable[..., int])
 
 
@@ -11,6 +13,7 @@ def validate_result(func: FunctionCore) -> FunctionCore:
     """
     A decorator to validate the output.
     Takes the expected result from the `expected_result` argument of the checked function.
+    The call is a memoization scope: reports the statistics of the caches used and clears the run-scoped ones.
     :param func: The function to be checked. Add an `expected_result` argument with the expected result value.
     :return: The return value of hte checked function
     """
@@ -18,8 +21,9 @@ def validate_result(func: FunctionCore) -> FunctionCore:
         print()
         expected_result: int | None = kwargs.pop('expected_result') if 'expected_result' in kwargs else None
         start_time = datetime.now()
-        result: int = func(*args, **kwargs)
-        end_time = datetime.now()
+        with memoization_scope():
+            result: int = func(*args, **kwargs)
+            end_time = datetime.now()
         elapsed_time = end_time - start_time
         minutes, seconds = divmod(int(elapsed_time.total_seconds()), 60)
         print(f"Elapsed time: {minutes}:{seconds:02d}")
@@ -3,10 +3,11 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import StrEnum
-from functools import cache
+from functools import cached_property
 from typing import Iterable, Callable, Generator, overload, Self
 
-from coordinates import Coordinates
+from coordinates import Coordinates, Direction, DirectionUnit
+from memoization import memoize, MemoizationScope
 
 
 @dataclass
@@ -33,7 +34,7 @@ class Tile[Representation: StrEnum](ABC):
         return cls(cls.representation_from_string(value))
 
     @classmethod
-    @cache
+    @memoize(scope=MemoizationScope.PROCESS)  # the singletons have to stay the same objects across runs
     def get_singleton(cls, value: str) -> Self:
         return cls.get_new(value)
 
@@ -190,3 +191,102 @@ class Map[GenericTile: Tile](list[list[GenericTile]]):
         for row in self:
             for item in row:
                 yield item
+
+
+@dataclass(frozen=True)
+class WeightedGraph:
+    """
+    A compact weighted directed graph in the CSR (compressed sparse row) layout.
+    The edges leaving the vertex `v` go to `targets[offsets[v]:offsets[v + 1]]`
+    with the weights `weights[offsets[v]:offsets[v + 1]]`.
+    """
+    vertices: list[Coordinates]
+    offsets: list[int]
+    targets: list[int]
+    weights: list[int]
+
+    @cached_property
+    def vertex_indices(self) -> dict[Coordinates, int]:
+        return {coordinates: index for index, coordinates in enumerate(self.vertices)}
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.vertices)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def get_edges(self, vertex: int) -> Generator[tuple[int, int], None, None]:
+        for edge in range(self.offsets[vertex], self.offsets[vertex + 1]):
+            yield self.targets[edge], self.weights[edge]
+
+
+def contract_corridors[GenericTile: Tile](
+        map_grid: Map[GenericTile],
+        is_walkable: Callable[[GenericTile], bool],
+        get_directions: Callable[[GenericTile], Iterable[Direction]] = lambda _: DirectionUnit,
+        keep: Iterable[Coordinates] = (),
+) -> WeightedGraph:
+    """
+    Contracts the corridors of the map into a weighted graph.
+    The vertices are the walkable tiles with other than 2 walkable neighbors (crossroads and dead ends)
+    and the `keep` tiles, the edges are the corridors between them weighted by their length.
+    A corridor can only be walked in the directions `get_directions` allows on each of its tiles.
+    Every corridor is walked once from each of its ends without any recursion,
+    so the contraction is linear in the number of tiles.
+    """
+    height = map_grid.height
+    width = map_grid.width
+    walkable = [is_walkable(tile) for tile in map_grid.all_tiles()]
+
+    def get_moves(position: int) -> list[int]:
+        from_top, from_left = divmod(position, width)
+        moves = []
+        for direction in get_directions(map_grid.get_item(from_top, from_left)):
+            new_top = from_top + direction.down
+            new_left = from_left + direction.right
+            if 0 <= new_top < height and 0 <= new_left < width and walkable[new_top * width + new_left]:
+                moves.append(new_top * width + new_left)
+        return moves
+
+    kept = {coordinates.from_top * width + coordinates.from_left for coordinates in keep}
+    vertex_indices: dict[int, int] = dict()
+    for position, is_position_walkable in enumerate(walkable):
+        if not is_position_walkable:
+            continue
+        from_top, from_left = divmod(position, width)
+        walkable_neighbors = sum(
+            1
+            for direction in DirectionUnit
+            if 0 <= from_top + direction.down < height and 0 <= from_left + direction.right < width
+            and walkable[(from_top + direction.down) * width + from_left + direction.right]
+        )
+        if walkable_neighbors != 2 or position in kept:
+            vertex_indices[position] = len(vertex_indices)
+
+    offsets = [0]
+    targets: list[int] = []
+    weights: list[int] = []
+    for vertex in vertex_indices:
+        for first_step in get_moves(vertex):
+            previous = vertex
+            current = first_step
+            length = 1
+            while current not in vertex_indices:
+                moves = [move for move in get_moves(current) if move != previous]
+                if len(moves) != 1:
+                    break  # the directions do not allow going on
+                previous, current = current, moves[0]
+                length += 1
+            else:
+                targets.append(vertex_indices[current])
+                weights.append(length)
+        offsets.append(len(targets))
+
+    return WeightedGraph(
+        [Coordinates(*divmod(position, width)) for position in vertex_indices],
+        offsets,
+        targets,
+        weights,
+    )
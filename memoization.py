@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import StrEnum
+from functools import lru_cache
+from typing import Callable, Iterator, TypeVar, Any
+
+Result = TypeVar("Result")
+
+
+class MemoizationScope(StrEnum):
+    RUN = "run"  # cleared when the run (see `memoization_scope`) ends
+    PROCESS = "process"  # kept until cleared explicitly
+
+
+@dataclass
+class MemoizationStatistics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def calls(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.calls if self.calls > 0 else 0.0
+
+    def __add__(self, other: MemoizationStatistics) -> MemoizationStatistics:
+        return MemoizationStatistics(
+            self.hits + other.hits,
+            self.misses + other.misses,
+            self.evictions + other.evictions,
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"{self.hits} hits, {self.misses} misses, {self.evictions} evictions"
+            f" ({self.hit_rate:.0%} hit rate)"
+        )
+
+
+class Memoization:
+    """
+    The bookkeeping of a function cached by `memoize`.
+    The caching itself is `functools.lru_cache`, so a hit costs no more than with `functools.cache`;
+    the statistics are derived from its `cache_info` only when asked for.
+    """
+    registry: list[Memoization] = []
+
+    def __init__(self, cached: Callable[..., Any], scope: MemoizationScope):
+        self.cached = cached
+        self.scope = scope
+        self._clear_cached = cached.cache_clear
+        self._collected = MemoizationStatistics()  # before the last clear, since the last reset
+        self._baseline = MemoizationStatistics()  # at the last reset, since the last clear
+        Memoization.registry.append(self)
+
+    @property
+    def name(self) -> str:
+        return self.cached.__qualname__
+
+    def _get_statistics_since_clear(self) -> MemoizationStatistics:
+        info = self.cached.cache_info()
+        # every miss adds an entry, so the ones not there anymore were evicted
+        return MemoizationStatistics(info.hits, info.misses, info.misses - info.currsize)
+
+    @property
+    def statistics(self) -> MemoizationStatistics:
+        since_clear = self._get_statistics_since_clear()
+        return self._collected + MemoizationStatistics(
+            since_clear.hits - self._baseline.hits,
+            since_clear.misses - self._baseline.misses,
+            since_clear.evictions - self._baseline.evictions,
+        )
+
+    def cache_clear(self) -> None:
+        self._collected = self.statistics
+        self._baseline = MemoizationStatistics()
+        self._clear_cached()
+
+    def reset_statistics(self) -> MemoizationStatistics:
+        """
+        :return: The statistics collected until now.
+        """
+        statistics = self.statistics
+        self._collected = MemoizationStatistics()
+        self._baseline = self._get_statistics_since_clear()
+        return statistics
+
+
+def memoize(
+        max_size: int | None = None,
+        scope: MemoizationScope = MemoizationScope.RUN,
+) -> Callable[[Callable[..., Result]], Callable[..., Result]]:
+    """
+    A decorator to cache the results of a function with hashable arguments.
+    The decorated function gets a `memoization` attribute with its `Memoization`,
+    and its `cache_clear` goes through `Memoization.cache_clear`, so the statistics survive the clear.
+    :param max_size: The most results kept. The least recently used one is evicted first. `None` for no bound.
+    :param scope: `RUN` to clear the cache when the run ends, `PROCESS` to keep it until cleared explicitly.
+        Use `PROCESS` if the identity of the results matters, e.g. for singletons.
+    """
+    def decorator(func: Callable[..., Result]) -> Callable[..., Result]:
+        cached = lru_cache(maxsize=max_size)(func)
+        cached.memoization = Memoization(cached, scope)
+        cached.cache_clear = cached.memoization.cache_clear
+        return cached
+
+    return decorator
+
+
+def report_memoization() -> None:
+    for memoization in Memoization.registry:
+        statistics = memoization.statistics
+        if statistics.calls > 0:
+            print(f"Cache {memoization.name}: {statistics}")
+
+
+@contextmanager
+def memoization_scope() -> Iterator[None]:
+    """
+    Marks a run: counts the cache statistics from its start and reports them at its end.
+    The caches with the `RUN` scope are cleared at the end, so they do not hold the inputs of the finished runs.
+    """
+    for memoization in Memoization.registry:
+        memoization.reset_statistics()
+    try:
+        yield
+    finally:
+        report_memoization()
+        for memoization in Memoization.registry:
+            if memoization.scope is MemoizationScope.RUN:
+                memoization.cache_clear()
@@ -1,4 +1,6 @@
-from typing import Union, Optional, List
+from typing import Union, Optional, List, Tuple
+
+import numpy
 
 
 class Number:
@@ -103,6 +105,100 @@ def part_12(
     return [result_parts, result_gears]
 
 
+def load_schematic(file_name: str) -> numpy.ndarray:
+    """
+    :return: The schematic characters as a 2D array of bytes surrounded with dots.
+    """
+    with open(file_name, "rb") as f:
+        lines = f.read().split()
+    schematic = numpy.frombuffer(b"".join(lines), dtype=numpy.uint8).reshape(len(lines), -1)
+    return numpy.pad(schematic, 1, constant_values=ord("."))
+
+
+def get_neighborhoods(grid: numpy.ndarray) -> List[numpy.ndarray]:
+    """
+    :return: The 9 shifted views of the grid without its border: item [y][x] of the views is the 3x3 neighborhood of
+        item [y + 1][x + 1] of the grid.
+    """
+    height, width = grid.shape
+    return [grid[d_y:height - 2 + d_y, d_x:width - 2 + d_x] for d_y in range(3) for d_x in range(3)]
+
+
+MAX_INT64_DIGITS = 6  # a sum of up to a million products of two such numbers still fits int64
+
+
+def label_numbers(schematic: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Labels every run of digits 1, 2, ... in the reading order.
+    The dots around the schematic keep the runs from continuing into the next row.
+    :return: The label of every tile (0 for no digit) and the values of the numbers by their labels.
+    """
+    is_digit = (schematic >= ord("0")) & (schematic <= ord("9"))
+    flat_is_digit = is_digit.ravel()
+    starts = flat_is_digit.copy()
+    starts[1:] &= ~flat_is_digit[:-1]
+    ends = flat_is_digit.copy()
+    ends[:-1] &= ~flat_is_digit[1:]
+    labels = numpy.cumsum(starts) * flat_is_digit
+
+    start_positions = numpy.flatnonzero(starts)
+    end_positions = numpy.flatnonzero(ends)
+    if len(end_positions) > 0 and (end_positions - start_positions).max() >= MAX_INT64_DIGITS:
+        # the sums of the gear ratios could overflow int64, so the values are Python ints
+        flat_schematic = schematic.tobytes()
+        values = numpy.array([0] + [
+            int(flat_schematic[start:end + 1])
+            for start, end in zip(start_positions, end_positions)
+        ], dtype=object)
+        return labels.reshape(schematic.shape), values
+
+    positions = numpy.flatnonzero(flat_is_digit)
+    digit_labels = labels[positions]
+    digits = schematic.ravel()[positions].astype(numpy.int64) - ord("0")
+    values = numpy.zeros(len(end_positions) + 1, dtype=numpy.int64)
+    numpy.add.at(values, digit_labels, digits * 10 ** (end_positions[digit_labels - 1] - positions))
+    return labels.reshape(schematic.shape), values
+
+
+def part_12_vectorized(
+        file_name: str,
+        expected_result_parts: Optional[int] = None,
+        expected_result_gears: Optional[int] = None
+) -> List[int]:
+    schematic = load_schematic(file_name)
+    labels, values = label_numbers(schematic)
+    inner_labels = labels[1:-1, 1:-1]
+    inner_schematic = schematic[1:-1, 1:-1]
+
+    # parts: the numbers with a digit in the symbol mask dilated by the 3x3 neighborhood
+    is_symbol = (inner_labels == 0) & (inner_schematic != ord("."))
+    near_symbol = numpy.logical_or.reduce(get_neighborhoods(numpy.pad(is_symbol, 1)))
+    part_labels = numpy.unique(inner_labels[near_symbol & (inner_labels > 0)])
+    result_parts = int(values[part_labels].sum())
+
+    # gears: a table of the labels in the neighborhood of every "*", the distinct ones sorted first in its row
+    gear_y, gear_x = numpy.nonzero(inner_schematic == ord("*"))
+    gear_labels = numpy.sort(numpy.stack([
+        neighborhood[gear_y, gear_x]
+        for neighborhood in get_neighborhoods(labels)
+    ], axis=1), axis=1)
+    is_distinct = gear_labels > 0
+    is_distinct[:, 1:] &= gear_labels[:, 1:] != gear_labels[:, :-1]
+    is_gear = is_distinct.sum(axis=1) == 2
+    gear_values = numpy.where(is_distinct, values[gear_labels], 1)[is_gear]
+    result_gears = int(gear_values.prod(axis=1).sum())
+
+    if expected_result_parts is not None:
+        msg = f"expected_parts={expected_result_parts} actual_parts={result_parts}"
+        assert expected_result_parts == result_parts, msg
+    if expected_result_gears is not None:
+        msg = f"expected_gears={expected_result_gears} actual_gears={result_gears}"
+        assert expected_result_gears == result_gears, msg
+    return [result_parts, result_gears]
+
+
 if __name__ == '__main__':
     print(part_12("example.txt", 4361, 467835))
     print(part_12("input.txt", 528799, 84907174))
+    print(part_12_vectorized("example.txt", 4361, 467835))
+    print(part_12_vectorized("input.txt", 528799, 84907174))
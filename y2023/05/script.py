@@ -1,5 +1,17 @@
 from __future__ import annotations
-from typing import List, Optional, Union
+
+import bisect
+from functools import reduce
+from typing import List, Optional, Union, Tuple
+
+import numpy
+
+
+def check_expectations(expected: List[Optional[int]], actual: List[int]) -> None:
+    for task_part in range(len(expected)):
+        if expected[task_part] is not None:
+            msg = f"expected={expected[task_part]} actual={actual[task_part]}"
+            assert expected[task_part] == actual[task_part], msg
 
 
 class Range:
@@ -67,6 +79,164 @@ class Range:
             ranges[i] = merged
         return ranges
 
+    @staticmethod
+    def merge_overlapping_ranges(ranges: List[Range]) -> List[Range]:
+        """
+        The same as `compress_overlapping_ranges`, but builds a new list in one pass after sorting.
+        """
+        result: List[Range] = []
+        for r in sorted(ranges, key=(lambda r: r.start)):
+            if len(result) > 0 and r.start <= result[-1].end_excluded:
+                if r.end_excluded > result[-1].end_excluded:
+                    result[-1] = Range(result[-1].start, r.end_excluded - result[-1].start)
+                continue
+            result.append(r)
+        return result
+
+
+class StageMap:
+    """
+    One stage of the almanac compiled into a piecewise-linear function of sorted, non-overlapping segments.
+    The segment i starts at the source `starts[i]`, ends where the next one starts (the last one never ends)
+    and moves its sources by `offsets[i]`. The sources without a mapping line are in segments with offset 0.
+    """
+
+    def __init__(self, starts: List[int], offsets: List[int]):
+        self.starts = starts
+        self.offsets = offsets
+
+    def __repr__(self):
+        return " ".join(f"{start}:{offset:+}" for start, offset in zip(self.starts, self.offsets))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _add_segment(self, start: int, offset: int) -> None:
+        if len(self.starts) > 0 and self.starts[-1] == start:
+            # the previous segment would be empty
+            self.starts.pop()
+            self.offsets.pop()
+        if len(self.offsets) > 0 and self.offsets[-1] == offset:
+            # the previous segment continues
+            return
+        self.starts.append(start)
+        self.offsets.append(offset)
+
+    @classmethod
+    def compile(cls, mapping_lines: List[Tuple[int, int, int]]) -> StageMap:
+        """
+        :param mapping_lines: The (destination start, source start, length) lines of the stage.
+        """
+        stage_map = cls([0], [0])
+        for start_destination, start_source, length in sorted(mapping_lines, key=(lambda m: m[1])):
+            stage_map._add_segment(start_source, start_destination - start_source)
+            stage_map._add_segment(start_source + length, 0)
+        return stage_map
+
+    def translate_ranges(self, ranges: List[Range]) -> List[Range]:
+        """
+        Merges the overlapping ranges and sweeps them sorted by their start along the segments,
+        so every segment is passed only once.
+        :return: The translated pieces of the ranges, not sorted.
+        """
+        result: List[Range] = []
+        i = 0
+        for r in Range.merge_overlapping_ranges(ranges):
+            i = bisect.bisect_right(self.starts, r.start, lo=i) - 1
+            start = r.start
+            while True:
+                end = r.end_excluded if i + 1 == len(self.starts) else min(r.end_excluded, self.starts[i + 1])
+                result.append(Range(start + self.offsets[i], end - start))
+                if end == r.end_excluded:
+                    break
+                start = end
+                i += 1
+        return result
+
+    def translate_point(self, point: int) -> int:
+        return point + self.offsets[bisect.bisect_right(self.starts, point) - 1]
+
+    def translate_points(self, points: numpy.ndarray) -> numpy.ndarray:
+        """
+        Translates a whole array of points at once.
+        The sources without a mapping line are in the segments too, so no mask is needed.
+        """
+        starts = numpy.array(self.starts, dtype=numpy.int64)
+        offsets = numpy.array(self.offsets, dtype=numpy.int64)
+        return points + offsets[numpy.searchsorted(starts, points, side="right") - 1]
+
+    def get_lowest(self, ranges: List[Range]) -> Optional[int]:
+        """
+        The lowest value is always the start of a range or the start of a segment inside it,
+        so only the segments overlapping the ranges are scanned.
+        :return: `None` if there are no ranges.
+        """
+        lowest: Optional[int] = None
+        for r in ranges:
+            i = bisect.bisect_right(self.starts, r.start) - 1
+            while i < len(self.starts) and self.starts[i] < r.end_excluded:
+                value = max(r.start, self.starts[i]) + self.offsets[i]
+                if lowest is None or value < lowest:
+                    lowest = value
+                i += 1
+        return lowest
+
+    def then(self, other: StageMap) -> StageMap:
+        """
+        :return: The composition: this stage followed by the other one.
+        """
+        result = StageMap([], [])
+        for i, (start, offset) in enumerate(zip(self.starts, self.offsets)):
+            end = None if i + 1 == len(self.starts) else self.starts[i + 1]
+            j = bisect.bisect_right(other.starts, start + offset) - 1
+            while True:
+                result._add_segment(max(start, other.starts[j] - offset), offset + other.offsets[j])
+                j += 1
+                if j == len(other.starts) or (end is not None and other.starts[j] - offset >= end):
+                    break
+        return result
+
+    @staticmethod
+    def compose(stages: List[StageMap]) -> StageMap:
+        """
+        :return: One map doing all the stages, so any number of queries can skip replaying them.
+        """
+        return reduce(StageMap.then, stages, StageMap([0], [0]))
+
+
+def load_almanac(file_name: str) -> Tuple[List[int], List[StageMap]]:
+    """
+    :return: The seeds numbers and the compiled stages.
+    """
+    seeds: List[int] = []
+    stages: List[StageMap] = []
+    mapping_lines: Optional[List[Tuple[int, int, int]]] = None
+    with open(file_name) as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("seeds:"):
+                seeds = [int(n) for n in line.split(":")[1].split()]
+            elif ":" in line:
+                if mapping_lines is not None:
+                    stages.append(StageMap.compile(mapping_lines))
+                mapping_lines = []
+            elif line != "":
+                start_destination, start_source, length = [int(i) for i in line.split(" ")]
+                mapping_lines.append((start_destination, start_source, length))
+    if mapping_lines is not None:
+        stages.append(StageMap.compile(mapping_lines))
+    return seeds, stages
+
+
+def get_seed_ranges(seeds: List[int]) -> List[List[Range]]:
+    """
+    :return: The seeds as ranges for both task parts: single seeds for the first, (start, length) pairs for the second.
+    """
+    return [
+        [Range(n) for n in seeds],
+        [Range(*seeds[i: i + 2]) for i in range(0, len(seeds), 2)],
+    ]
+
 
 def part_1(
         file_name: str,
@@ -113,14 +283,57 @@ def part_1(
         min(r.start for r in step_values[task_part] + next_values[task_part])
         for task_part in range(len(step_values))
     ]
-    expected_lowest_location = [expected_lowest_location_1, expected_lowest_location_2]
-    for task_part in range(len(expected_lowest_location)):
-        if expected_lowest_location[task_part] is not None:
-            msg = f"expected={expected_lowest_location[task_part]} actual={lowest_location[task_part]}"
-            assert expected_lowest_location[task_part] == lowest_location[task_part], msg
+    check_expectations([expected_lowest_location_1, expected_lowest_location_2], lowest_location)
+    return lowest_location
+
+
+def part_1_compiled(
+        file_name: str,
+        expected_lowest_location_1: Optional[int] = None,
+        expected_lowest_location_2: Optional[int] = None,
+) -> List[int]:
+    seeds, stages = load_almanac(file_name)
+    lowest_location = []
+    for ranges in get_seed_ranges(seeds):
+        ranges = Range.merge_overlapping_ranges(ranges)
+        for stage in stages:
+            ranges = Range.merge_overlapping_ranges(stage.translate_ranges(ranges))
+        lowest_location.append(ranges[0].start)
+    check_expectations([expected_lowest_location_1, expected_lowest_location_2], lowest_location)
+    return lowest_location
+
+
+def part_1_composed(
+        file_name: str,
+        expected_lowest_location_1: Optional[int] = None,
+        expected_lowest_location_2: Optional[int] = None,
+) -> List[int]:
+    seeds, stages = load_almanac(file_name)
+    seed_to_location = StageMap.compose(stages)
+    lowest_location = [seed_to_location.get_lowest(ranges) for ranges in get_seed_ranges(seeds)]
+    check_expectations([expected_lowest_location_1, expected_lowest_location_2], lowest_location)
+    return lowest_location
+
+
+def part_1_vectorized(
+        file_name: str,
+        expected_lowest_location_1: Optional[int] = None,
+) -> int:
+    seeds, stages = load_almanac(file_name)
+    points = numpy.array(seeds, dtype=numpy.int64)
+    for stage in stages:
+        points = stage.translate_points(points)
+    lowest_location = int(points.min())
+    check_expectations([expected_lowest_location_1], [lowest_location])
     return lowest_location
 
 
 if __name__ == '__main__':
     print(part_1("example.txt", 35, 46))
     print(part_1("input.txt", 240320250, 28580589))
+    print(part_1_compiled("example.txt", 35, 46))
+    print(part_1_compiled("input.txt", 240320250, 28580589))
+    print(part_1_composed("example.txt", 35, 46))
+    print(part_1_composed("input.txt", 240320250, 28580589))
+    print(part_1_vectorized("example.txt", 35))
+    print(part_1_vectorized("input.txt", 240320250))
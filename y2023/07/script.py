@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from typing import List, Optional, Union, Dict
+from typing import List, Optional, Union, Dict, Tuple, Iterable, BinaryIO, Iterator
+from array import array
+from contextlib import ExitStack
 from enum import Enum
 import functools
+import heapq
+import tempfile
 
 
 def check_expectations(expected, actual):
@@ -150,6 +154,54 @@ class Hand:
         return False  # equal
 
 
+CARD_VALUES: Dict[bool, Dict[str, int]] = {
+    False: {lbl.label: lbl.value for lbl in CardLabelOriginal},
+    True: {lbl.label: lbl.value for lbl in CardLabelAlternative},
+}
+HAND_TYPE_VALUES: Dict[Tuple[int, ...], int] = {tuple(h.main_groups_counts): h.value for h in HandType}
+BID_BITS = 32
+
+
+def get_hand_key(cards: str, alternative: bool) -> int:
+    """
+    Encodes the hand into an int ordered the same way as `Hand`: the hand type, then the cards as base-16 digits.
+    """
+    values = CARD_VALUES[alternative]
+    key = 0
+    groups: Dict[str, int] = {}
+    for c in cards:
+        key = key * 16 + values[c]
+        groups[c] = groups.get(c, 0) + 1
+    jokers = groups.pop("J", 0) if alternative else 0
+    groups_counts = sorted(groups.values(), reverse=True) or [0]
+    groups_counts[0] += jokers
+    return HAND_TYPE_VALUES[tuple(groups_counts)] * 16 ** 5 + key
+
+
+def get_hand_record(line: str, alternative: bool) -> int:
+    """
+    :return: The hand key and the bid packed into one int, so the hands sort as plain ints.
+    """
+    cards, bid = line.split()
+    if len(cards) != 5:
+        raise ValueError(f"Expected 5 cards, got this: {cards}")
+    bid = int(bid)
+    if not 0 <= bid < 1 << BID_BITS:
+        raise ValueError(f"Bid out of range: {bid}")
+    return get_hand_key(cards, alternative) << BID_BITS | bid
+
+
+def get_total_winnings(records: Iterable[int]) -> int:
+    """
+    :param records: The packed hand records from `get_hand_record`, sorted.
+    """
+    bid_mask = (1 << BID_BITS) - 1
+    result = 0
+    for index, record in enumerate(records):
+        result += (index + 1) * (record & bid_mask)
+    return result
+
+
 def part_1(
         file_name: str,
         alternative: bool,
@@ -171,8 +223,84 @@ def part_1(
     return result
 
 
+def part_1_keys(
+        file_name: str,
+        alternative: bool,
+        expected_result: Optional[int] = None,
+) -> int:
+    with open(file_name) as f:
+        records = [get_hand_record(line, alternative) for line in f if line.strip()]
+    records.sort()
+    result = get_total_winnings(records)
+
+    check_expectations(expected_result, result)
+    return result
+
+
+RECORD_TYPECODE = "Q"  # one unsigned 64-bit record per hand
+
+
+def write_run(records: List[int], stack: ExitStack) -> BinaryIO:
+    """
+    Sorts the records and spills them to a temporary file closed with the stack.
+    """
+    records.sort()
+    run = stack.enter_context(tempfile.TemporaryFile())
+    array(RECORD_TYPECODE, records).tofile(run)
+    run.seek(0)
+    return run
+
+
+def read_run(run: BinaryIO, buffer_records: int) -> Iterator[int]:
+    buffer = array(RECORD_TYPECODE)
+    while True:
+        chunk = run.read(buffer_records * buffer.itemsize)
+        if len(chunk) == 0:
+            return
+        buffer = array(RECORD_TYPECODE, chunk)
+        yield from buffer
+
+
+def part_1_external(
+        file_name: str,
+        alternative: bool,
+        run_records: int = 1_000_000,
+        buffer_records: int = 8192,
+        expected_result: Optional[int] = None,
+) -> int:
+    """
+    External merge sort: sorts runs of at most `run_records` hands, spills them to temporary files
+    and merges them while adding up the winnings, so the memory does not grow with the file.
+    :param buffer_records: How many records are read from each run at once during the merge.
+    """
+    with ExitStack() as stack:
+        runs: List[BinaryIO] = []
+        records: List[int] = []
+        with open(file_name) as f:
+            for line in f:
+                if line.strip():
+                    records.append(get_hand_record(line, alternative))
+                if len(records) == run_records:
+                    runs.append(write_run(records, stack))
+                    records = []
+        if len(records) > 0:
+            runs.append(write_run(records, stack))
+        result = get_total_winnings(heapq.merge(*(read_run(run, buffer_records) for run in runs)))
+
+    check_expectations(expected_result, result)
+    return result
+
+
 if __name__ == '__main__':
     print(part_1("example.txt", False, 6440))
     print(part_1("input.txt", False, 246409899))
     print(part_1("example.txt", True, 5905))
     print(part_1("input.txt", True, 244848487))
+    print(part_1_keys("example.txt", False, 6440))
+    print(part_1_keys("input.txt", False, 246409899))
+    print(part_1_keys("example.txt", True, 5905))
+    print(part_1_keys("input.txt", True, 244848487))
+    print(part_1_external("example.txt", False, 2, expected_result=6440))
+    print(part_1_external("input.txt", False, expected_result=246409899))
+    print(part_1_external("example.txt", True, 2, expected_result=5905))
+    print(part_1_external("input.txt", True, 100, expected_result=244848487))
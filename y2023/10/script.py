@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import List, Optional, Union, Dict, Set
+from typing import List, Optional, Union, Dict, Set, Tuple
+from dataclasses import dataclass
 from enum import Enum
 
 
@@ -188,6 +189,80 @@ class MapOfPipes:
         return result
 
 
+FLAT_DIRECTIONS = "NESW"  # turning right is +1, the opposite direction is +2
+FLAT_PIPE_DIRECTIONS = [PipeDirection.NORTH, PipeDirection.EAST, PipeDirection.SOUTH, PipeDirection.WEST]
+FLAT_CONNECTIONS: Dict[str, str] = {
+    pipe_type.letter: "".join(
+        d
+        for d, direction in zip(FLAT_DIRECTIONS, FLAT_PIPE_DIRECTIONS)
+        if direction in pipe_type.directions
+    )
+    for pipe_type in PipeType
+}
+# (pipe letter, direction of the move onto the pipe) -> direction of the move from the pipe
+FLAT_TURNS: Dict[Tuple[str, int], int] = {
+    (letter, (FLAT_DIRECTIONS.index(entry) + 2) % 4): FLAT_DIRECTIONS.index(exit_)
+    for letter, connections in FLAT_CONNECTIONS.items() if len(connections) == 2
+    for entry, exit_ in [connections, connections[::-1]]
+}
+
+
+@dataclass(frozen=True)
+class FlatLoop:
+    """
+    The loop traced once over the map text as a flat buffer.
+    Keeps only the length and the corners (x, y) in the loop order, the straight pipes do not matter for the area.
+    """
+    length: int
+    corners: List[Tuple[int, int]]
+
+    @classmethod
+    def trace(cls, file_name: str) -> FlatLoop:
+        with open(file_name) as f:
+            text = f.read()
+        stride = text.index("\n") + 1
+        steps = [-stride, 1, stride, -1]
+        start = text.index("S")
+        start_directions = [
+            d
+            for d, step in enumerate(steps)
+            if 0 <= start + step < len(text)
+            and FLAT_DIRECTIONS[(d + 2) % 4] in FLAT_CONNECTIONS.get(text[start + step], "")
+        ]
+        assert len(start_directions) == 2
+        first_direction = start_directions[0]
+        corners: List[Tuple[int, int]] = []
+        if start_directions[1] - first_direction != 2:
+            corners.append((start % stride, start // stride))
+        position = start
+        direction = first_direction
+        length = 0
+        while True:
+            position += steps[direction]
+            length += 1
+            character = text[position]
+            if character == "S":
+                return cls(length, corners)
+            new_direction = FLAT_TURNS[character, direction]
+            if new_direction != direction:
+                corners.append((position % stride, position // stride))
+                direction = new_direction
+
+    def get_far_point_distance(self) -> int:
+        return self.length // 2
+
+    def get_internals_count(self) -> int:
+        """
+        The shoelace formula gives the area of the polygon through the tile centers of the corners,
+        Pick's theorem gives the tiles inside from the area and the number of the loop tiles on its boundary.
+        """
+        double_area = abs(sum(
+            x * next_y - next_x * y
+            for (x, y), (next_x, next_y) in zip(self.corners, self.corners[1:] + self.corners[:1])
+        ))
+        return (double_area - self.length) // 2 + 1
+
+
 def part_1(
         file_name: str,
         expected_result: Optional[int] = None,
@@ -210,6 +285,26 @@ def part_2(
     return result
 
 
+def part_1_flat(
+        file_name: str,
+        expected_result: Optional[int] = None,
+) -> int:
+    result = FlatLoop.trace(file_name).get_far_point_distance()
+
+    check_expectations(expected_result, result)
+    return result
+
+
+def part_2_flat(
+        file_name: str,
+        expected_result: Optional[int] = None,
+) -> int:
+    result = FlatLoop.trace(file_name).get_internals_count()
+
+    check_expectations(expected_result, result)
+    return result
+
+
 if __name__ == '__main__':
     print(part_1("example-1.txt", 4))
     print(part_1("example-2.txt", 8))
@@ -221,3 +316,13 @@ if __name__ == '__main__':
     print(part_2("example-3.txt", 4))
     print(part_2("example-4.txt", 8))
     print(part_2("input.txt", 589))
+    print(part_1_flat("example-1.txt", 4))
+    print(part_1_flat("example-2.txt", 8))
+    print(part_1_flat("example-3.txt", 23))
+    print(part_1_flat("example-4.txt", 70))
+    print(part_1_flat("input.txt", 7063))
+    print(part_2_flat("example-1.txt", 1))
+    print(part_2_flat("example-2.txt", 1))
+    print(part_2_flat("example-3.txt", 4))
+    print(part_2_flat("example-4.txt", 8))
+    print(part_2_flat("input.txt", 589))
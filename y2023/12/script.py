@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from typing import List, Optional, Union, Dict, Set, Tuple, Callable
+import multiprocessing
+import os
+from typing import List, Optional, Union, Dict, Set, Tuple, Callable, Iterable
+
+from memoization import memoize, memoization_scope, MemoizationStatistics
 
 
 def check_expectations(expected, actual):
@@ -36,19 +40,7 @@ def brute_force_count_possibilities(row_characters: Union[List[str], str], numbe
     row_characters[unknown_index] = "?"
 
 
-cache: Dict[Tuple[str, Tuple[int]], int] = dict()
-
-
-def cached_function_results(guts: Callable[[str, Tuple[int]], int]):
-    def cached_function(row: str, numbers: Tuple[int]) -> int:
-        if (row, numbers) not in cache:
-            cache[row, numbers] = guts(row, numbers)
-        return cache[row, numbers]
-
-    return cached_function
-
-
-@cached_function_results
+@memoize()
 def smarter_count_possibilities(row: str, numbers: Tuple[int]) -> int:
     if len(numbers) == 0:
         return 0 if "#" in row else 1
@@ -72,13 +64,236 @@ def smarter_count_possibilities(row: str, numbers: Tuple[int]) -> int:
     return result
 
 
+def tabulated_count_possibilities(row: str, numbers: Tuple[int]) -> int:
+    """
+    Bottom-up DP over integer positions: `ways[i][j]` is the number of arrangements of `numbers[j:]` in `row[i:]`.
+    Prefix sums of "." make checking that a block fits O(1), so no substrings are needed.
+    """
+    row_length = len(row)
+    numbers_count = len(numbers)
+    dots_before = [0] * (row_length + 1)  # number of "." in row[:i]
+    for i, character in enumerate(row):
+        dots_before[i + 1] = dots_before[i] + (character == ".")
+
+    ways = [[0] * (numbers_count + 1) for _ in range(row_length + 2)]
+    ways[row_length][numbers_count] = 1
+    ways[row_length + 1][numbers_count] = 1  # after a block ending at the row end
+    for i in range(row_length - 1, -1, -1):
+        character = row[i]
+        ways_here = ways[i]
+        ways_next = ways[i + 1]
+        for j in range(numbers_count + 1):
+            result = 0
+            if character != "#":
+                # the spring is operational
+                result = ways_next[j]
+            if j < numbers_count:
+                end_index = i + numbers[j]
+                if (
+                        end_index <= row_length
+                        and dots_before[end_index] == dots_before[i]  # no "." in the block
+                        and (end_index == row_length or row[end_index] != "#")  # the block ends there
+                ):
+                    result += ways[end_index + 1][j + 1]
+            ways_here[j] = result
+    return ways[0][0]
+
+
+Polynomial = List[int]  # coefficients by the number of completed cycles of the groups
+TransferMatrix = List[Dict[int, Polynomial]]  # from state: to state: polynomial
+
+
+def _get_automaton_states(numbers: Tuple[int]) -> List[Tuple[int, int]]:
+    """
+    The states of the nondeterministic automaton matching the groups, as (group index, run state).
+    The run state is 0 before the group, -1 right after the previous group (a "#" is not allowed)
+    and the number of "#" of the group matched so far otherwise.
+    """
+    states: List[Tuple[int, int]] = []
+    for group_index, number in enumerate(numbers):
+        states.extend([(group_index, 0), (group_index, -1)])
+        states.extend((group_index, run) for run in range(1, number))
+    return states
+
+
+def _get_automaton_steps(
+        state: Tuple[int, int],
+        character: str,
+        numbers: Tuple[int],
+) -> Iterable[Tuple[Tuple[int, int], int]]:
+    """
+    :return: The (state, completed cycles) the automaton can get to by reading the character.
+    """
+    group_index, run = state
+
+    def finish_group() -> Tuple[Tuple[int, int], int]:
+        next_group_index = (group_index + 1) % len(numbers)
+        return (next_group_index, -1), 1 if next_group_index == 0 else 0
+
+    if run <= 0 and character in ".?":
+        yield (group_index, 0), 0
+    if run >= 0 and character in "#?":
+        if run + 1 == numbers[group_index]:
+            yield finish_group()
+        else:
+            yield (group_index, run + 1), 0
+
+
+def _add_polynomial(target: Dict[int, Polynomial], state: int, polynomial: Polynomial, shift: int, max_degree: int) -> None:
+    if state not in target:
+        target[state] = []
+    result = target[state]
+    for degree, coefficient in enumerate(polynomial[:max_degree + 1 - shift]):
+        if coefficient == 0:
+            continue
+        while len(result) <= degree + shift:
+            result.append(0)
+        result[degree + shift] += coefficient
+
+
+def _multiply_polynomials(a: Polynomial, b: Polynomial, max_degree: int) -> Polynomial:
+    a = a[:max_degree + 1]
+    b = b[:max_degree + 1]
+    if len(a) == 0 or len(b) == 0:
+        return []
+    if min(len(a), len(b)) <= 64:
+        result = [0] * min(len(a) + len(b) - 1, max_degree + 1)
+        for i, x in enumerate(a):
+            if x == 0:
+                continue
+            for j, y in enumerate(b[:max_degree + 1 - i]):
+                result[i + j] += x * y
+        return result
+    # Kronecker substitution: pack each polynomial into a single big int with slots wide enough
+    # for any coefficient of the product, so that a single (Karatsuba) big int multiplication does all the work
+    slot_bytes = (max(a).bit_length() + max(b).bit_length() + min(len(a), len(b)).bit_length() + 7) // 8
+    packed = (
+            int.from_bytes(b"".join(x.to_bytes(slot_bytes, "little") for x in a), "little")
+            * int.from_bytes(b"".join(y.to_bytes(slot_bytes, "little") for y in b), "little")
+    )
+    result_length = min(len(a) + len(b) - 1, max_degree + 1)
+    raw = packed.to_bytes((len(a) + len(b)) * slot_bytes, "little")
+    return [int.from_bytes(raw[i * slot_bytes:(i + 1) * slot_bytes], "little") for i in range(result_length)]
+
+
+def _compile_transfer_matrix(
+        row: str,
+        numbers: Tuple[int],
+        states: List[Tuple[int, int]],
+        max_degree: int,
+) -> TransferMatrix:
+    """
+    Runs the automaton over the row from every state at once.
+    """
+    indices = {state: index for index, state in enumerate(states)}
+    steps = {
+        (index, character): [(indices[to_state], cycles) for to_state, cycles in _get_automaton_steps(state, character, numbers)]
+        for index, state in enumerate(states)
+        for character in ".#?"
+    }
+    matrix: TransferMatrix = []
+    for from_index in range(len(states)):
+        current: Dict[int, Polynomial] = {from_index: [1]}
+        for character in row:
+            following: Dict[int, Polynomial] = dict()
+            for index, polynomial in current.items():
+                for to_index, cycles in steps[index, character]:
+                    _add_polynomial(following, to_index, polynomial, cycles, max_degree)
+            current = following
+        matrix.append(current)
+    return matrix
+
+
+def _multiply_transfer_matrices(a: TransferMatrix, b: TransferMatrix, max_degree: int) -> TransferMatrix:
+    result: TransferMatrix = []
+    for row in a:
+        result_row: Dict[int, Polynomial] = dict()
+        for middle, polynomial in row.items():
+            for to_index, other_polynomial in b[middle].items():
+                _add_polynomial(result_row, to_index, _multiply_polynomials(polynomial, other_polynomial, max_degree), 0, max_degree)
+        result.append(result_row)
+    return result
+
+
+def transfer_matrix_count_possibilities(row: str, numbers: Tuple[int], multiplier: int) -> int:
+    """
+    Counts the arrangements of the row unfolded `multiplier` times without building the unfolded row.
+    One copy of the row followed by the joining "?" is compiled into a transfer matrix of the automaton
+    matching the groups. The polynomial entries count the arrangements by the number of completed cycles
+    of the groups, so the groups do not need to be repeated either. The copies are composed by repeated squaring
+    and the arrangements completing exactly `multiplier` cycles of the groups are counted.
+    The polynomials stay short when the number of group cycles a copy can hold is (nearly) forced,
+    otherwise they grow up to `multiplier` terms and long ones are multiplied by Kronecker substitution.
+    :param row: A single copy of the row.
+    :param numbers: A single copy of the groups.
+    """
+    states = _get_automaton_states(numbers)
+    joined_copy = _compile_transfer_matrix(row + "?", numbers, states, multiplier)
+    last_copy = _compile_transfer_matrix(row, numbers, states, multiplier)
+
+    # vector times the (multiplier - 1)-th power of the joined copy, by repeated squaring
+    vector: Dict[int, Polynomial] = {states.index((0, 0)): [1]}
+    power = joined_copy
+    exponent = multiplier - 1
+    while exponent > 0:
+        if exponent % 2 == 1:
+            vector = _multiply_transfer_matrices([vector], power, multiplier)[0]
+        exponent //= 2
+        if exponent > 0:
+            power = _multiply_transfer_matrices(power, power, multiplier)
+    vector = _multiply_transfer_matrices([vector], last_copy, multiplier)[0]
+
+    result = 0
+    for accepting_state in [(0, 0), (0, -1)]:
+        polynomial = vector.get(states.index(accepting_state), [])
+        if len(polynomial) > multiplier:
+            result += polynomial[multiplier]
+    return result
+
+
+def get_chunks(file_name: str, chunk_count: int) -> List[Tuple[int, int]]:
+    """
+    :return: Byte ranges (start, end) splitting the file into at most `chunk_count` chunks of whole lines.
+        A line belongs to the chunk its first byte is in.
+    """
+    size = os.path.getsize(file_name)
+    boundaries = [0]
+    with open(file_name, "rb") as f:
+        for i in range(1, chunk_count):
+            f.seek(max(size * i // chunk_count - 1, boundaries[-1]))
+            f.readline()  # moves to the start of the next line
+            boundaries.append(max(f.tell(), boundaries[-1]))
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+
+def _initialize_worker(cache_size: int) -> None:
+    global smarter_count_possibilities
+    # a new bounded cache, also so that a forked worker does not start with the parent's cache;
+    # the recursion calls the function by its global name, so it uses the new cache too
+    smarter_count_possibilities = memoize(cache_size)(smarter_count_possibilities.__wrapped__)
+
+
+def _count_chunk(file_name: str, start: int, end: int, multiplier: int) -> Tuple[int, MemoizationStatistics]:
+    smarter_count_possibilities.memoization.reset_statistics()
+    result = 0
+    with open(file_name, "rb") as f:
+        f.seek(start)
+        while f.tell() < end:
+            line = f.readline().decode()
+            if len(line.strip()) == 0:
+                continue
+            result += smarter_count_possibilities(*parse_line(line, multiplier))
+    return result, smarter_count_possibilities.memoization.reset_statistics()
+
+
 def part_1(
         file_name: str,
         multiplier: int,
         expected_result: Optional[int] = None,
 ) -> int:
     result = 0
-    with open(file_name) as f:
+    with memoization_scope(), open(file_name) as f:
         for line in f:
             result += smarter_count_possibilities(*parse_line(line, multiplier))
 
@@ -86,6 +301,63 @@ def part_1(
     return result
 
 
+def part_1_tabulated(
+        file_name: str,
+        multiplier: int,
+        expected_result: Optional[int] = None,
+) -> int:
+    result = 0
+    with open(file_name) as f:
+        for line in f:
+            result += tabulated_count_possibilities(*parse_line(line, multiplier))
+
+    check_expectations(expected_result, result)
+    return result
+
+
+def part_1_transfer_matrix(
+        file_name: str,
+        multiplier: int,
+        expected_result: Optional[int] = None,
+) -> int:
+    result = 0
+    with open(file_name) as f:
+        for line in f:
+            result += transfer_matrix_count_possibilities(*parse_line(line), multiplier)
+
+    check_expectations(expected_result, result)
+    return result
+
+
+def part_1_parallel(
+        file_name: str,
+        multiplier: int,
+        processes: Optional[int] = None,
+        chunks_per_process: int = 4,
+        cache_size: int = 100_000,
+        expected_result: Optional[int] = None,
+) -> int:
+    """
+    Splits the file into byte-range chunks of whole lines and counts them in a process pool.
+    Every worker has its own cache, bounded to `cache_size` least recently used entries.
+    The bound has to hold the subproblems of a whole row, otherwise the recursion stops being polynomial.
+    """
+    processes = os.cpu_count() if processes is None else processes
+    chunks = get_chunks(file_name, processes * chunks_per_process)
+    result = 0
+    statistics = MemoizationStatistics()
+    with multiprocessing.Pool(processes, _initialize_worker, (cache_size,)) as pool:
+        for chunk_result, chunk_statistics in pool.starmap(
+                _count_chunk, [(file_name, start, end, multiplier) for start, end in chunks]
+        ):
+            result += chunk_result
+            statistics += chunk_statistics
+    print(f"Cache {smarter_count_possibilities.__qualname__}: {statistics}")
+
+    check_expectations(expected_result, result)
+    return result
+
+
 if __name__ == '__main__':
     print(part_1("example-0.txt", 1, 6))
     print(part_1("example-1.txt", 1, 1))
@@ -108,3 +380,35 @@ if __name__ == '__main__':
     print(part_1("example-22.txt", 5, 111063614))
     print(part_1("example.txt", 5, 525152))
     print(part_1("input.txt", 5, 45322533163795))
+    print()
+    print(part_1_tabulated("example-0.txt", 1, 6))
+    print(part_1_tabulated("example-1.txt", 1, 1))
+    print(part_1_tabulated("example-2.txt", 1, 4))
+    print(part_1_tabulated("example-3.txt", 1, 1))
+    print(part_1_tabulated("example-4.txt", 1, 1))
+    print(part_1_tabulated("example-5.txt", 1, 4))
+    print(part_1_tabulated("example-6.txt", 1, 10))
+    print(part_1_tabulated("example-22.txt", 1, 21))
+    print(part_1_tabulated("example.txt", 1, 21))
+    print(part_1_tabulated("input.txt", 1, 8193))
+    print(part_1_tabulated("example-0.txt", 5, 6))
+    print(part_1_tabulated("example-1.txt", 5, 1))
+    print(part_1_tabulated("example-2.txt", 5, 16384))
+    print(part_1_tabulated("example-3.txt", 5, 1))
+    print(part_1_tabulated("example-4.txt", 5, 16))
+    print(part_1_tabulated("example-5.txt", 5, 2500))
+    print(part_1_tabulated("example-6.txt", 5, 506250))
+    print(part_1_tabulated("example-22.txt", 5, 111063614))
+    print(part_1_tabulated("example.txt", 5, 525152))
+    print(part_1_tabulated("input.txt", 5, 45322533163795))
+    print()
+    print(part_1_transfer_matrix("example.txt", 1, 21))
+    print(part_1_transfer_matrix("example-22.txt", 5, 111063614))
+    print(part_1_transfer_matrix("example.txt", 5, 525152))
+    print(part_1_transfer_matrix("input.txt", 5, 45322533163795))
+    print(part_1_transfer_matrix("example.txt", 100, part_1_tabulated("example.txt", 100)))
+    print()
+    print(part_1_parallel("example.txt", 1, expected_result=21))
+    print(part_1_parallel("example.txt", 5, expected_result=525152))
+    print(part_1_parallel("input.txt", 1, expected_result=8193))
+    print(part_1_parallel("input.txt", 5, expected_result=45322533163795))
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
-import functools
-from typing import List, Optional, Union, Dict, Set, Tuple, Callable
+import heapq
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Union, Dict, Set, Tuple, Callable, Iterable
+
+import numpy
 
 
 def check_expectations(expected, actual):
@@ -14,28 +21,38 @@ Y = 1
 XY = [X, Y]
 
 
-@functools.total_ordering
+HeatField = List[List[List[int]]]  # [y][x][xy] minimum heat loss when arriving along the xy axis
+State = Tuple[int, int, int]  # x, y, xy
+
+
 class CityTile:
     INFINITY = 9999999999999999
 
     def __init__(self, digit: Union[str, int], x: int, y: int):
         self.local_heat_loss = int(digit)
         self.coordinates = [x, y]
-        self.minimum_heat_from = [CityTile.INFINITY, CityTile.INFINITY]
 
-    def get_comparable(self) -> Tuple:
-        return min(self.minimum_heat_from), min(self.coordinates), self.local_heat_loss
 
-    def __lt__(self, other: CityTile):
-        return self.get_comparable() < other.get_comparable()
+@dataclass(frozen=True)
+class HeatQuery:
+    min_distance: int
+    max_distance: int
+    source: Optional[Tuple[int, int]] = None  # the first tile by default
+    target: Optional[Tuple[int, int]] = None  # the last tile by default
 
 
 class CityMap:
+    """
+    The parsed city grid. Heat paths are computed lazily per (min_distance, max_distance, source) configuration
+    and the resulting heat fields are kept, so one loaded grid can answer many queries.
+    """
+
     def __init__(
             self,
             file_name: str,
-            min_distance: int,
-            max_distance: int,
+            min_distance: int = 1,
+            max_distance: int = 3,
+            vectorized: bool = False,
     ):
         self._map: List[List[CityTile]] = []
         with open(file_name) as f:
@@ -44,7 +61,8 @@ class CityMap:
                 self._map.append(row)
         self.min_distance = min_distance
         self.max_distance = max_distance
-        self._compute_heat_path()
+        self.vectorized = vectorized  # use the NumPy relaxation instead of the per-tile loop
+        self._heat_fields: Dict[Tuple[int, int, Tuple[int, int]], HeatField] = dict()
 
     def get_tile(self, x: int, y: int) -> CityTile:
         assert self.is_valid_coordinate(x, y)
@@ -65,36 +83,266 @@ class CityMap:
                 self.first_tile_index[Y] <= y <= self.last_tile_index[Y]
         )
 
-    def _compute_heat_path(self):
-        origin = self.get_tile(*self.first_tile_index)
-        origin.minimum_heat_from = [0, 0]
-        to_update_neighbors_from = [{origin}, {origin}]
+    def get_heat_field(
+            self,
+            min_distance: Optional[int] = None,
+            max_distance: Optional[int] = None,
+            source: Optional[Tuple[int, int]] = None,
+    ) -> HeatField:
+        """
+        :return: For every tile (indexed `[y][x]`) the minimum heat loss when arriving to it along the X and the Y axis.
+        """
+        min_distance = self.min_distance if min_distance is None else min_distance
+        max_distance = self.max_distance if max_distance is None else max_distance
+        source = self.first_tile_index if source is None else tuple(source)
+        key = (min_distance, max_distance, source)
+        if key not in self._heat_fields:
+            if self.vectorized:
+                self._heat_fields[key] = self._compute_heat_path_vectorized(min_distance, max_distance, source)
+            else:
+                self._heat_fields[key] = self._compute_heat_path(min_distance, max_distance, source)
+        return self._heat_fields[key]
+
+    def get_minimum_heat_loss(
+            self,
+            min_distance: Optional[int] = None,
+            max_distance: Optional[int] = None,
+            source: Optional[Tuple[int, int]] = None,
+            target: Optional[Tuple[int, int]] = None,
+    ) -> int:
+        x, y = self.last_tile_index if target is None else target
+        assert self.is_valid_coordinate(x, y)
+        return min(self.get_heat_field(min_distance, max_distance, source)[y][x])
+
+    def get_minimum_heat_losses(self, queries: Iterable[HeatQuery]) -> List[int]:
+        return [
+            self.get_minimum_heat_loss(query.min_distance, query.max_distance, query.source, query.target)
+            for query in queries
+        ]
+
+    def forget_heat_fields(self) -> None:
+        """
+        Drops the computed heat fields. Needed after changing `local_heat_loss` of any tile directly,
+        `set_local_heat_loss` repairs them instead.
+        """
+        self._heat_fields.clear()
+
+    def _compute_heat_path(self, min_distance: int, max_distance: int, source: Tuple[int, int]) -> HeatField:
+        heat_field: HeatField = [[[CityTile.INFINITY, CityTile.INFINITY] for _ in row] for row in self._map]
+        origin = self.get_tile(*source)
+        heat_field[origin.coordinates[Y]][origin.coordinates[X]] = [0, 0]
+        to_update_neighbors_from: List[Set[CityTile]] = [{origin}, {origin}]
         while sum(len(to_update) for to_update in to_update_neighbors_from) > 0:
             for xy, to_update_neighbors_from_xy in enumerate(to_update_neighbors_from):
                 if len(to_update_neighbors_from_xy) == 0:
                     continue
-                current = min(to_update_neighbors_from_xy)  # TODO: optimization: only use the current xy dimension here
+                current = min(
+                    to_update_neighbors_from_xy,
+                    key=lambda tile: heat_field[tile.coordinates[Y]][tile.coordinates[X]][xy],
+                )
                 to_update_neighbors_from_xy.remove(current)
                 for direction in [-1, 1]:
-                    current_heat = current.minimum_heat_from[xy]
                     current_coordinates = current.coordinates
-                    for delta in range(1, self.max_distance + 1):
+                    current_heat = heat_field[current_coordinates[Y]][current_coordinates[X]][xy]
+                    for delta in range(1, max_distance + 1):
                         new_coordinates = tuple(
                             c + direction * delta * abs(i - xy) for i, c in enumerate(current_coordinates)
                         )
                         if not self.is_valid_coordinate(*new_coordinates):
                             break
                         new_tile = self.get_tile(*new_coordinates)
-                        current_heat += self.get_tile(*new_coordinates).local_heat_loss
-                        if delta < self.min_distance:
+                        current_heat += new_tile.local_heat_loss
+                        if delta < min_distance:
                             continue
-                        if new_tile.minimum_heat_from[1 - xy] <= current_heat:
+                        new_heat = heat_field[new_coordinates[Y]][new_coordinates[X]]
+                        if new_heat[1 - xy] <= current_heat:
                             continue
-                        new_tile.minimum_heat_from[1 - xy] = current_heat
+                        new_heat[1 - xy] = current_heat
                         to_update_neighbors_from[1 - xy].add(new_tile)
+        return heat_field
+
+    def _compute_heat_path_vectorized(
+            self,
+            min_distance: int,
+            max_distance: int,
+            source: Tuple[int, int],
+    ) -> HeatField:
+        """
+        Keeps one distance plane per arrival axis and relaxes whole planes at once:
+        for every allowed run length the cost of the run comes from prefix sums of the heat losses
+        and the planes are shifted by the run length. Repeats until nothing changes.
+        """
+        heat = numpy.array([[tile.local_heat_loss for tile in row] for row in self._map], dtype=numpy.int64)
+        height, width = heat.shape
+        # prefix[..., i] is the sum of the first i heat losses on the row (column)
+        prefix_x = numpy.zeros((height, width + 1), dtype=numpy.int64)
+        numpy.cumsum(heat, axis=1, out=prefix_x[:, 1:])
+        prefix_y = numpy.zeros((width, height + 1), dtype=numpy.int64)
+        numpy.cumsum(heat.T, axis=1, out=prefix_y[:, 1:])
+
+        planes = numpy.full((2, height, width), CityTile.INFINITY, dtype=numpy.int64)
+        planes[:, source[Y], source[X]] = 0
+        while True:
+            previous = planes.copy()
+            # arriving along X means the previous run went along Y, and vice versa;
+            # the Y plane is relaxed on transposed views so both axes share the same code
+            for xy, prefix in ((X, prefix_x), (Y, prefix_y)):
+                target = planes[xy] if xy == X else planes[xy].T
+                origin = planes[1 - xy] if xy == X else planes[1 - xy].T
+                length = target.shape[1]
+                for delta in range(min_distance, min(max_distance, length - 1) + 1):
+                    # run forward: from i to i + delta, paying for tiles i + 1 .. i + delta
+                    cost = prefix[:, delta + 1:] - prefix[:, 1:length - delta + 1]
+                    numpy.minimum(target[:, delta:], origin[:, :-delta] + cost, out=target[:, delta:])
+                    # run backward: from i + delta to i, paying for tiles i .. i + delta - 1
+                    cost = prefix[:, delta:length] - prefix[:, :length - delta]
+                    numpy.minimum(target[:, :-delta], origin[:, delta:] + cost, out=target[:, :-delta])
+            if numpy.array_equal(planes, previous):
+                break
+        return numpy.moveaxis(planes, 0, -1).tolist()
+
+    def set_local_heat_loss(self, x: int, y: int, local_heat_loss: int) -> int:
+        """
+        Changes the heat loss of a single tile and repairs all the computed heat fields,
+        touching only the states whose minimum heat loss depended on the tile (LPA*-like dynamic SSSP).
+        :return: The number of states whose heat loss had to be settled again.
+        """
+        tile = self.get_tile(x, y)
+        difference = local_heat_loss - tile.local_heat_loss
+        if difference == 0:
+            return 0
+        tile.local_heat_loss = local_heat_loss
+        repaired = 0
+        for (min_distance, max_distance, source), heat_field in self._heat_fields.items():
+            repaired += self._repair_heat_field(heat_field, min_distance, max_distance, source, x, y, difference)
+        return repaired
+
+    def _get_runs(
+            self,
+            x: int,
+            y: int,
+            xy: int,
+            min_distance: int,
+            max_distance: int,
+            incoming: bool = False,
+    ) -> Iterable[Tuple[int, int, int]]:
+        """
+        Yields the tiles reachable by a single run along the xy axis together with the heat lost on the way.
+        With `incoming`, yields the tiles from which a single run reaches this one instead.
+        """
+        for direction in [-1, 1]:
+            heat = self.get_tile(x, y).local_heat_loss if incoming else 0
+            for delta in range(1, max_distance + 1):
+                new_x = x + direction * delta * (1 - xy)
+                new_y = y + direction * delta * xy
+                if not self.is_valid_coordinate(new_x, new_y):
+                    break
+                new_heat_loss = self.get_tile(new_x, new_y).local_heat_loss
+                if not incoming:
+                    heat += new_heat_loss
+                if delta >= min_distance:
+                    yield new_x, new_y, heat
+                if incoming:
+                    heat += new_heat_loss
+
+    def _get_runs_over(
+            self,
+            x: int,
+            y: int,
+            min_distance: int,
+            max_distance: int,
+    ) -> Iterable[Tuple[State, State, int]]:
+        """
+        Yields all the runs (from state, to state, heat loss) that pay for the tile at the given coordinates.
+        """
+        for xy in XY:
+            for direction in [-1, 1]:
+                for skipped in range(1, max_distance + 1):
+                    from_x = x - direction * skipped * (1 - xy)
+                    from_y = y - direction * skipped * xy
+                    if not self.is_valid_coordinate(from_x, from_y):
+                        break
+                    heat = 0
+                    for delta in range(1, max_distance + 1):
+                        to_x = from_x + direction * delta * (1 - xy)
+                        to_y = from_y + direction * delta * xy
+                        if not self.is_valid_coordinate(to_x, to_y):
+                            break
+                        heat += self.get_tile(to_x, to_y).local_heat_loss
+                        if delta >= max(skipped, min_distance):
+                            yield (from_x, from_y, 1 - xy), (to_x, to_y, xy), heat
+
+    def _repair_heat_field(
+            self,
+            heat_field: HeatField,
+            min_distance: int,
+            max_distance: int,
+            source: Tuple[int, int],
+            x: int,
+            y: int,
+            difference: int,
+    ) -> int:
+        def get(state: State) -> int:
+            return heat_field[state[Y]][state[X]][state[2]]
+
+        def put(state: State, heat: int) -> None:
+            heat_field[state[Y]][state[X]][state[2]] = heat
+
+        def is_source(state: State) -> bool:
+            return (state[X], state[Y]) == source
+
+        to_settle: List[Tuple[int, State]] = []
+        changed_runs = list(self._get_runs_over(x, y, min_distance, max_distance))
+        if difference > 0:
+            # states that were reached through the tile lose their support, and so do their descendants
+            unsupported: Set[State] = set()
+            to_check = [
+                to_state
+                for from_state, to_state, heat in changed_runs
+                if get(from_state) + heat - difference == get(to_state) and not is_source(to_state)
+            ]
+            while len(to_check) > 0:
+                state = to_check.pop()
+                if state in unsupported:
+                    continue
+                unsupported.add(state)
+                for new_x, new_y, heat in self._get_runs(*state[:2], 1 - state[2], min_distance, max_distance):
+                    new_state = (new_x, new_y, 1 - state[2])
+                    if get(state) + heat == get(new_state) and not is_source(new_state):
+                        to_check.append(new_state)
+            for state in unsupported:
+                put(state, CityTile.INFINITY)
+            # re-attach them to the supported rest of the field
+            for state in unsupported:
+                best = CityTile.INFINITY
+                for from_x, from_y, heat in self._get_runs(*state, min_distance, max_distance, incoming=True):
+                    from_state = (from_x, from_y, 1 - state[2])
+                    if from_state not in unsupported:
+                        best = min(best, get(from_state) + heat)
+                if best < CityTile.INFINITY:
+                    put(state, best)
+                    heapq.heappush(to_settle, (best, state))
+        else:
+            for from_state, to_state, heat in changed_runs:
+                if get(from_state) + heat < get(to_state):
+                    put(to_state, get(from_state) + heat)
+                    heapq.heappush(to_settle, (get(to_state), to_state))
+
+        settled = 0
+        while len(to_settle) > 0:
+            heat, state = heapq.heappop(to_settle)
+            if heat > get(state):
+                continue
+            settled += 1
+            for new_x, new_y, run_heat in self._get_runs(*state[:2], 1 - state[2], min_distance, max_distance):
+                new_state = (new_x, new_y, 1 - state[2])
+                if heat + run_heat < get(new_state):
+                    put(new_state, heat + run_heat)
+                    heapq.heappush(to_settle, (heat + run_heat, new_state))
+        return settled
 
     def get_minimum_heat_path_heat_loss(self) -> int:
-        return min(self.get_tile(*self.last_tile_index).minimum_heat_from)
+        return self.get_minimum_heat_loss()
 
 
 def part_1(
@@ -108,8 +356,102 @@ def part_1(
     return result
 
 
+def part_1_vectorized(
+        file_name: str,
+        min_distance: int,
+        max_distance: int,
+        expected_result: Optional[int] = None,
+) -> int:
+    result = CityMap(file_name, min_distance, max_distance, vectorized=True).get_minimum_heat_path_heat_loss()
+    check_expectations(expected_result, result)
+    return result
+
+
+def part_1_multiple_queries(
+        file_name: str,
+        queries: List[HeatQuery],
+        expected_results: Optional[List[int]] = None,
+) -> List[int]:
+    results = CityMap(file_name).get_minimum_heat_losses(queries)
+    check_expectations(expected_results, results)
+    return results
+
+
+def part_1_after_changes(
+        file_name: str,
+        min_distance: int,
+        max_distance: int,
+        changes: List[Tuple[int, int, int]],
+        expected_result: Optional[int] = None,
+) -> int:
+    """
+    Computes the heat field once, then applies the (x, y, local heat loss) changes one by one,
+    repairing the field incrementally. Every repaired field is checked against a computation from scratch.
+    """
+    city = CityMap(file_name, min_distance, max_distance)
+    city.get_heat_field()
+    for x, y, local_heat_loss in changes:
+        repaired = city.set_local_heat_loss(x, y, local_heat_loss)
+        print(f"({x},{y}) -> {local_heat_loss}: repaired {repaired} states")
+        check_expectations(city._compute_heat_path(min_distance, max_distance, city.first_tile_index), city.get_heat_field())
+    result = city.get_minimum_heat_path_heat_loss()
+    check_expectations(expected_result, result)
+    return result
+
+
+def write_synthetic_city(file_name: str, width: int, height: int, max_heat_loss: int = 9, seed: int = 17) -> None:
+    generator = random.Random(seed)
+    with open(file_name, "w") as f:
+        for _ in range(height):
+            f.write("".join(str(generator.randint(1, max_heat_loss)) for _ in range(width)) + "\n")
+
+
+def benchmark(
+        file_name: str,
+        min_distance: int,
+        max_distance: int,
+) -> Dict[str, float]:
+    """
+    Runs both engines on the same city, checks that they agree and returns the elapsed seconds per engine.
+    """
+    timings: Dict[str, float] = dict()
+    results: Dict[str, int] = dict()
+    for engine, vectorized in [("loop", False), ("numpy", True)]:
+        start_time = time.perf_counter()
+        results[engine] = CityMap(file_name, min_distance, max_distance, vectorized).get_minimum_heat_path_heat_loss()
+        timings[engine] = time.perf_counter() - start_time
+    check_expectations(results["loop"], results["numpy"])
+    print(f"{file_name} ({min_distance}, {max_distance}): " + ", ".join(
+        f"{engine}={timing:.2f}s" for engine, timing in timings.items()
+    ))
+    return timings
+
+
+def benchmark_synthetic(width: int, height: int, max_heat_loss: int = 9) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, f"synthetic-{width}x{height}-{max_heat_loss}.txt")
+        write_synthetic_city(file_name, width, height, max_heat_loss)
+        benchmark(file_name, 1, 3)
+        benchmark(file_name, 4, 10)
+
+
 if __name__ == '__main__':
     print(part_1("example.txt", 1, 3, 102))
     print(part_1("input.txt", 1, 3, 866))
     print(part_1("example.txt", 4, 10, 94))
     print(part_1("input.txt", 4, 10, 1010))
+    print(part_1_multiple_queries("example.txt", [HeatQuery(1, 3), HeatQuery(4, 10), HeatQuery(1, 3, target=(0, 0))], [102, 94, 0]))
+    print(part_1_multiple_queries("example.txt", [HeatQuery(1, 3, (12, 12), (0, 0)), HeatQuery(1, 3, (12, 12), (12, 11))], [101, 5]))
+    print(part_1_after_changes("example.txt", 1, 3, [(5, 0, 9), (12, 12, 3), (1, 0, 1), (5, 0, 1), (12, 12, 9)], 103))
+    print(part_1_after_changes("example.txt", 4, 10, [(6, 6, 1), (6, 6, 9), (12, 4, 1), (0, 0, 5)], 89))
+    print(part_1_after_changes("example.txt", 1, 3, [(0, 0, 9)], 102))
+
+    print(part_1_vectorized("example.txt", 1, 3, 102))
+    print(part_1_vectorized("input.txt", 1, 3, 866))
+    print(part_1_vectorized("example.txt", 4, 10, 94))
+    print(part_1_vectorized("input.txt", 4, 10, 1010))
+
+    benchmark("input.txt", 1, 3)
+    benchmark("input.txt", 4, 10)
+    # benchmark_synthetic(200, 200)
+    # benchmark_synthetic(200, 200, max_heat_loss=1)
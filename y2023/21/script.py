@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import heapq
+import math
+import os
+import random
+import tempfile
+from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional, Union, Dict, Set, Tuple, Callable
+from typing import List, Optional, Union, Dict, Set, Tuple, Callable, Iterable
+
+import numpy
 
 
 def check_expectations(expected, actual):
@@ -215,6 +223,547 @@ class GardenMapInfinite(GardenMap):
         return result
 
 
+class GardenFrontierSearch:
+    """
+    BFS over flat integer positions of a preallocated region.
+    Each step expands the whole frontier at once with array operations.
+    The region array keeps the parity of the distance of every reached position
+    and the parity counters are updated during the search, so no recount is needed.
+    The infinite garden is covered by a region reaching `steps` positions beyond the original map on every side.
+    """
+    UNREACHED = 0
+    REACHED_EVEN = 1
+    REACHED_ODD = 2
+
+    def __init__(self, garden: GardenMap, steps: int, infinite: bool):
+        self.steps = steps
+        self.chunk_width = garden.chunk_width
+        self.chunk_height = garden.chunk_height
+        self._rocks = numpy.array(
+            [[tile is GardenTile.ROCK for tile in row] for row in garden._chunk_map],
+            dtype=numpy.bool_,
+        )
+        self.margin = steps if infinite else 0
+        self.region_width = self.chunk_width + 2 * self.margin
+        self.region_height = self.chunk_height + 2 * self.margin
+        self._distance_parity = numpy.zeros(self.region_width * self.region_height, dtype=numpy.uint8)
+        self._start = (
+                (garden._start_coordinates.y + self.margin) * self.region_width
+                + garden._start_coordinates.x + self.margin
+        )
+        self.parity_counts = [0, 0]
+
+    def _get_neighbors(self, frontier: numpy.ndarray) -> numpy.ndarray:
+        from_top, from_left = numpy.divmod(frontier, self.region_width)
+        neighbors = numpy.concatenate((
+            frontier[from_left > 0] - 1,
+            frontier[from_left < self.region_width - 1] + 1,
+            frontier[from_top > 0] - self.region_width,
+            frontier[from_top < self.region_height - 1] + self.region_width,
+        ))
+        neighbors = neighbors[self._distance_parity[neighbors] == GardenFrontierSearch.UNREACHED]
+        from_top, from_left = numpy.divmod(neighbors, self.region_width)
+        is_rock = self._rocks[
+            (from_top - self.margin) % self.chunk_height,
+            (from_left - self.margin) % self.chunk_width,
+        ]
+        return numpy.unique(neighbors[~is_rock])
+
+    def iterate_reachable_counts(self) -> Iterable[int]:
+        """
+        :return: The number of positions reachable in exactly 0, 1, ..., `steps` steps.
+        """
+        frontier = numpy.array([self._start], dtype=numpy.int64)
+        self._distance_parity[frontier] = GardenFrontierSearch.REACHED_EVEN
+        self.parity_counts[0] += 1
+        yield self.parity_counts[0]
+        for step in range(1, self.steps + 1):
+            frontier = self._get_neighbors(frontier)
+            parity = step % 2
+            self._distance_parity[frontier] = GardenFrontierSearch.REACHED_ODD if parity else GardenFrontierSearch.REACHED_EVEN
+            self.parity_counts[parity] += len(frontier)
+            yield self.parity_counts[parity]
+
+    def run(self) -> int:
+        """
+        :return: The number of positions reachable in exactly `steps` steps.
+        """
+        result = 0
+        for result in self.iterate_reachable_counts():
+            pass
+        return result
+
+
+class GardenBitmask:
+    """
+    The whole (finite) garden as a single big-int bitmask, row after row.
+    Every row is followed by an always-empty guard bit, so shifting by one never wraps to a neighboring row.
+    A step is then a dilation by a few shifts and ORs, masked by the precomputed garden plots.
+    The masks of positions reachable in even and odd number of steps alternate.
+    """
+
+    def __init__(self, garden: GardenMap):
+        self.stride = garden.chunk_width + 1
+        bits = "".join(
+            "0" + "".join(
+                "0" if garden.get_value_xy(x, y) is GardenTile.ROCK else "1"
+                for x in reversed(range(garden.chunk_width))
+            )
+            for y in reversed(range(garden.chunk_height))
+        )
+        self.plots = int(bits, 2)
+        self.start = 1 << (garden._start_coordinates.y * self.stride + garden._start_coordinates.x)
+
+    def run(self, steps: int) -> int:
+        """
+        :return: The number of positions reachable in exactly `steps` steps.
+        """
+        stride = self.stride
+        plots = self.plots
+        reached = [self.start, 0]  # even, odd
+        unchanged = 0
+        for step in range(1, steps + 1):
+            parity = step % 2
+            previous = reached[1 - parity]
+            dilated = reached[parity] | ((previous << 1) | (previous >> 1) | (previous << stride) | (previous >> stride)) & plots
+            unchanged = unchanged + 1 if dilated == reached[parity] else 0
+            reached[parity] = dilated
+            if unchanged == 2:
+                break  # nothing new in both parities, the garden is filled
+        return reached[steps % 2].bit_count()
+
+
+class GardenExtrapolation:
+    """
+    Counts reachable positions of the infinite garden for huge step counts without any assumption about the input.
+    Samples the exact counts every period from the remainder of the step count, waits until the samples become
+    a quadratic polynomial (the third differences stay zero) and extrapolates the polynomial to the requested step count.
+    The base period is the least common multiple of the map dimensions, doubled if odd so that all the samples
+    have the same parity. When the walks around the rocks make the crossing of a chunk longer than the chunk,
+    the counts repeat only after a multiple of it, so the multiples are tried as well: up to `max_multiple`,
+    or all the multiples the search steps have enough samples for.
+    The search is limited to `max_search_cells` cells of the region around the map, so a map with a long period
+    (e.g. with coprime dimensions) fails with a `ValueError` instead of exhausting the memory.
+    """
+
+    def __init__(
+            self,
+            garden: GardenMap,
+            max_periods: int = 30,
+            confirmations: int = 3,
+            max_multiple: Optional[int] = None,
+            min_search_steps: int = 3000,
+            max_search_cells: int = 1 << 28,
+    ):
+        self.garden = garden
+        self.period = math.lcm(garden.chunk_width, garden.chunk_height)
+        if self.period % 2 == 1:
+            self.period *= 2  # the counts alternate with the parity of the steps
+        self.max_periods = max_periods
+        self.confirmations = confirmations
+        self.max_multiple = max_multiple
+        self.min_search_steps = min_search_steps  # the small maps need many periods before they settle
+        self.max_search_cells = max_search_cells
+
+    def get_max_search_steps(self) -> int:
+        """
+        :return: The most steps with a search region of at most `max_search_cells` cells.
+        """
+        width = self.garden.chunk_width
+        height = self.garden.chunk_height
+        # the largest root of (width + 2 * steps) * (height + 2 * steps) = max_search_cells
+        return max(0, (math.isqrt((width - height) ** 2 + 4 * self.max_search_cells) - width - height) // 4)
+
+    def count(self, steps: int) -> int:
+        search_steps = min(steps, max(self.max_periods * self.period, self.min_search_steps), self.get_max_search_steps())
+        if search_steps < steps and search_steps < (3 + self.confirmations) * self.period:
+            raise ValueError(
+                f"The period {self.period} is too long to sample within the {search_steps} steps"
+                f" allowed by the search region of {self.max_search_cells} cells."
+            )
+        max_multiple = self.max_multiple
+        if max_multiple is None:
+            max_multiple = max(1, search_steps // ((3 + self.confirmations) * self.period))
+        counts: List[int] = []
+        for step, reachable in enumerate(GardenFrontierSearch(self.garden, search_steps, infinite=True).iterate_reachable_counts()):
+            if step == steps:
+                return reachable  # no need to extrapolate
+            counts.append(reachable)
+            for multiple in range(1, max_multiple + 1):
+                period = multiple * self.period
+                if (steps - step) % period != 0:
+                    continue
+                samples = counts[step % period::period]
+                first_stable = self._get_first_stable_sample(samples)
+                if first_stable is not None:
+                    return self._extrapolate(samples[first_stable:first_stable + 3], steps // period - first_stable)
+        raise ValueError(
+            f"The reachable counts did not become quadratic within {search_steps} steps"
+            f" for any period up to {max_multiple} * {self.period}."
+        )
+
+    def _get_first_stable_sample(self, samples: List[int]) -> Optional[int]:
+        """
+        :return: The index of the first sample of a quadratic run that is at least `confirmations` long.
+        """
+        differences = samples
+        for _ in range(3):
+            differences = [b - a for a, b in zip(differences, differences[1:])]
+        if len(differences) < self.confirmations:
+            return None
+        if any(d != 0 for d in differences[-self.confirmations:]):
+            return None
+        return len(differences) - self.confirmations
+
+    @staticmethod
+    def _extrapolate(samples: List[int], k: int) -> int:
+        # Newton's forward differences of the quadratic
+        first_difference = samples[1] - samples[0]
+        second_difference = samples[2] - 2 * samples[1] + samples[0]
+        return samples[0] + k * first_difference + k * (k - 1) // 2 * second_difference
+
+
+@dataclass(frozen=True)
+class ChunkFill:
+    """
+    The result of filling one chunk from a normalized entry profile.
+    `exits` are the distances (relative to the profile minimum) of the border cells, side by side.
+    `reachable_up_to[parity][offset]` is the number of cells with a relative distance
+    of the given parity that is not greater than the offset.
+    """
+    exits: Tuple[Tuple[int, ...], ...]
+    reachable_up_to: Tuple[Tuple[int, ...], Tuple[int, ...]]
+
+    def count_reachable(self, steps_left: int) -> int:
+        """
+        :return: The number of cells reachable in exactly `steps_left` steps after the profile minimum.
+        """
+        if steps_left < 0:
+            return 0
+        reachable_up_to = self.reachable_up_to[steps_left % 2]
+        return reachable_up_to[min(steps_left, len(reachable_up_to) - 1)]
+
+    def count_reachable_repeated(self, steps_left: int, cost: int) -> int:
+        """
+        :return: The sum of `count_reachable` over the chunks reached `cost`, 2 * `cost`, ... steps later.
+        """
+        last_offset = len(self.reachable_up_to[0]) - 1
+        # the chunks reached early enough to have all their cells reached, then the parity alternates if `cost` is odd
+        filled = max(0, (steps_left - last_offset) // cost)
+        if cost % 2 == 0:
+            result = filled * self.reachable_up_to[steps_left % 2][-1]
+        else:
+            result = (
+                    (filled + 1) // 2 * self.reachable_up_to[(steps_left - 1) % 2][-1]
+                    + filled // 2 * self.reachable_up_to[steps_left % 2][-1]
+            )
+        for k in range(filled + 1, steps_left // cost + 1):
+            result += self.count_reachable(steps_left - k * cost)
+        return result
+
+
+class GardenChunkMemoization:
+    """
+    Fills the infinite garden chunk by chunk instead of cell by cell.
+    A chunk is entered through its borders; the entry distances of the border cells (the entry profile)
+    normalized by subtracting their minimum give the relative distances of the paths entering the chunk
+    and staying in it. The fill of every distinct normalized profile is computed once and reused for all the chunks
+    sharing it.
+    The chunks are processed in the order of their profile minimum and reprocessed if their profile improves,
+    which also covers the paths leaving a chunk and coming back to it.
+    The start chunk is always filled from the start merged with its profile.
+    Only a window of chunks around the start is filled: beyond it, the chunks are assumed to repeat the chunks
+    of the window border, one more chunk further costing a constant number of steps in each direction.
+    The assumption is checked by recomputing the profile of every chunk from its neighbors (if every chunk gets
+    the profile its neighbors give it, the distances are the shortest ones), and then the chunks beyond the window
+    are counted in closed form, so the cost does not grow with the step count.
+    Windows up to `max_radius` chunks are tried, then every chunk reachable is filled, which costs
+    O(chunks * perimeter).
+    """
+    INFINITY = 9999999999999999
+    TOP = 0
+    BOTTOM = 1
+    LEFT = 2
+    RIGHT = 3
+    NEIGHBORS = {  # exit side: chunk offset, entry side of the neighbor
+        TOP: ((0, -1), BOTTOM),
+        BOTTOM: ((0, 1), TOP),
+        LEFT: ((-1, 0), RIGHT),
+        RIGHT: ((1, 0), LEFT),
+    }
+
+    def __init__(self, garden: GardenMap, max_radius: int = 16):
+        self.garden = garden
+        self.chunk_width = garden.chunk_width
+        self.chunk_height = garden.chunk_height
+        self.max_radius = max_radius
+        self._rocks = [garden.get_value_xy(x, y) is GardenTile.ROCK for y in range(self.chunk_height) for x in range(self.chunk_width)]
+        self._sides: Tuple[List[int], ...] = (  # flat positions of the border cells, side by side
+            [x for x in range(self.chunk_width)],
+            [(self.chunk_height - 1) * self.chunk_width + x for x in range(self.chunk_width)],
+            [y * self.chunk_width for y in range(self.chunk_height)],
+            [y * self.chunk_width + self.chunk_width - 1 for y in range(self.chunk_height)],
+        )
+        self.profile_cache: Dict[Tuple[Tuple[int, ...], ...], ChunkFill] = dict()
+        self.processed_chunks = 0
+
+    def _fill(self, sources: Iterable[Tuple[int, int]]) -> ChunkFill:
+        """
+        Distances inside the chunk from the (position, distance) sources, walking the chunk only.
+        """
+        distances = [GardenChunkMemoization.INFINITY] * len(self._rocks)
+        to_do: List[Tuple[int, int]] = []
+        for position, distance in sources:
+            if not self._rocks[position] and distance < distances[position]:
+                distances[position] = distance
+                heapq.heappush(to_do, (distance, position))
+        while len(to_do) > 0:
+            distance, position = heapq.heappop(to_do)
+            if distance > distances[position]:
+                continue
+            from_top, from_left = divmod(position, self.chunk_width)
+            for neighbor, is_inside in [
+                (position - self.chunk_width, from_top > 0),
+                (position + self.chunk_width, from_top < self.chunk_height - 1),
+                (position - 1, from_left > 0),
+                (position + 1, from_left < self.chunk_width - 1),
+            ]:
+                if is_inside and not self._rocks[neighbor] and distance + 1 < distances[neighbor]:
+                    distances[neighbor] = distance + 1
+                    heapq.heappush(to_do, (distance + 1, neighbor))
+
+        reached = [d for d in distances if d < GardenChunkMemoization.INFINITY]
+        histogram = [0] * (max(reached, default=0) + 1)
+        for distance in reached:
+            histogram[distance] += 1
+        reachable_up_to: List[List[int]] = [[], []]
+        totals = [0, 0]
+        for distance, count in enumerate(histogram):
+            totals[distance % 2] += count
+            for parity in [0, 1]:
+                reachable_up_to[parity].append(totals[parity])
+        return ChunkFill(
+            tuple(tuple(distances[position] for position in side) for side in self._sides),
+            (tuple(reachable_up_to[0]), tuple(reachable_up_to[1])),
+        )
+
+    def _fill_from_profile(self, profile: List[List[int]]) -> Tuple[int, ChunkFill]:
+        minimum = min(min(side) for side in profile)
+        key = tuple(
+            tuple(d - minimum if d < GardenChunkMemoization.INFINITY else -1 for d in side)
+            for side in profile
+        )
+        if key not in self.profile_cache:
+            self.profile_cache[key] = self._fill(
+                (position, d)
+                for side, side_profile in zip(self._sides, key)
+                for position, d in zip(side, side_profile)
+                if d >= 0
+            )
+        return minimum, self.profile_cache[key]
+
+    def count(self, steps: int) -> int:
+        """
+        :return: The number of positions of the infinite garden reachable in exactly `steps` steps.
+        """
+        radius = 2
+        while radius <= self.max_radius:
+            # one more chunk around, so that the chunks at `radius` get the paths coming from further away as well
+            fills, profiles = self._fill_chunks(GardenChunkMemoization.INFINITY, radius + 1)
+            for period in range(1, radius // 2 + 1):
+                result = self._count_repeating(steps, fills, profiles, radius, period)
+                if result is not None:
+                    return result
+            radius *= 2
+        fills, _ = self._fill_chunks(steps)
+        return sum(fill.count_reachable(steps - minimum) for minimum, fill in fills.values())
+
+    def _fill_chunks(
+            self,
+            steps: int,
+            radius: Optional[int] = None,
+    ) -> Tuple[Dict[Tuple[int, int], Tuple[int, ChunkFill]], Dict[Tuple[int, int], List[List[int]]]]:
+        """
+        Fills the chunks reachable in `steps` steps, only up to `radius` chunks away from the start chunk if given.
+        :return: The profile minimum and the fill of every chunk reached, and the profiles.
+        """
+        start = self.garden._start_coordinates
+        start_source = (start.y * self.chunk_width + start.x, 0)
+        fills: Dict[Tuple[int, int], Tuple[int, ChunkFill]] = {
+            (0, 0): (0, self._fill([start_source])),
+        }
+        profiles: Dict[Tuple[int, int], List[List[int]]] = dict()
+        to_do: List[Tuple[int, Tuple[int, int]]] = []
+        self._propagate((0, 0), *fills[(0, 0)], steps, radius, profiles, to_do)
+        while len(to_do) > 0:
+            minimum, chunk = heapq.heappop(to_do)
+            profile = profiles[chunk]
+            if minimum != min(min(side) for side in profile):
+                continue  # outdated, the chunk is in the queue again with a better profile
+            self.processed_chunks += 1
+            if chunk == (0, 0):
+                # the paths leaving the start chunk and coming back, not shared with any other chunk
+                fills[chunk] = (0, self._fill([start_source] + [
+                    (position, d)
+                    for side, side_profile in zip(self._sides, profile)
+                    for position, d in zip(side, side_profile)
+                ]))
+            else:
+                fills[chunk] = self._fill_from_profile(profile)
+            self._propagate(chunk, *fills[chunk], steps, radius, profiles, to_do)
+        return fills, profiles
+
+    def _propagate(
+            self,
+            chunk: Tuple[int, int],
+            minimum: int,
+            fill: ChunkFill,
+            steps: int,
+            radius: Optional[int],
+            profiles: Dict[Tuple[int, int], List[List[int]]],
+            to_do: List[Tuple[int, Tuple[int, int]]],
+    ) -> None:
+        for side, ((offset_x, offset_y), neighbor_side) in GardenChunkMemoization.NEIGHBORS.items():
+            neighbor = (chunk[0] + offset_x, chunk[1] + offset_y)
+            if radius is not None and max(abs(neighbor[0]), abs(neighbor[1])) > radius:
+                continue
+            if neighbor not in profiles:
+                profiles[neighbor] = [
+                    [GardenChunkMemoization.INFINITY] * len(neighbor_side_cells)
+                    for neighbor_side_cells in self._sides
+                ]
+            neighbor_profile = profiles[neighbor][neighbor_side]
+            neighbor_side_cells = self._sides[neighbor_side]
+            improved = False
+            for i, exit_distance in enumerate(fill.exits[side]):
+                entry_distance = minimum + exit_distance + 1
+                if self._rocks[neighbor_side_cells[i]]:
+                    continue
+                if entry_distance <= steps and entry_distance < neighbor_profile[i]:
+                    neighbor_profile[i] = entry_distance
+                    improved = True
+            if improved:
+                heapq.heappush(to_do, (min(min(side) for side in profiles[neighbor]), neighbor))
+
+    def _count_repeating(
+            self,
+            steps: int,
+            fills: Dict[Tuple[int, int], Tuple[int, ChunkFill]],
+            profiles: Dict[Tuple[int, int], List[List[int]]],
+            radius: int,
+            period: int,
+    ) -> Optional[int]:
+        """
+        Counts with the chunks up to `radius` chunks away from the start chunk filled, and the chunks further away
+        repeating the last `period` chunks before them.
+        :return: `None` if the chunks do not repeat like that.
+        """
+        infinity = GardenChunkMemoization.INFINITY
+
+        def get_minimum(x: int, y: int) -> int:
+            return fills[(x, y)][0] if (x, y) in fills else infinity
+
+        costs: List[Optional[int]] = []  # of `period` more chunks to the left, right, top and bottom
+        for x, y in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            minimum = get_minimum(x * radius, y * radius)
+            minimum_before = get_minimum(x * (radius - period), y * (radius - period))
+            if minimum == minimum_before == infinity:
+                costs.append(None)  # walled off, nothing further in this direction is reached
+            elif 0 < minimum - minimum_before < infinity:
+                costs.append(minimum - minimum_before)
+            else:
+                return None
+        cost_left, cost_right, cost_top, cost_bottom = costs
+
+        def get_repeated_coordinate(
+                c: int,
+                cost_before: Optional[int],
+                cost_after: Optional[int],
+        ) -> Tuple[int, Optional[int]]:
+            if c > radius:
+                periods, offset = divmod(c - radius - 1, period)
+                return radius - period + 1 + offset, None if cost_after is None else (periods + 1) * cost_after
+            if c < -radius:
+                periods, offset = divmod(-radius - 1 - c, period)
+                return -(radius - period + 1 + offset), None if cost_before is None else (periods + 1) * cost_before
+            return c, 0
+
+        def get_repeated(x: int, y: int) -> Optional[Tuple[Tuple[int, int], int]]:
+            """
+            :return: The chunk of the window repeated by the chunk, and the additional steps to reach it,
+                or `None` if the chunk is walled off.
+            """
+            repeated_x, shift_x = get_repeated_coordinate(x, cost_left, cost_right)
+            repeated_y, shift_y = get_repeated_coordinate(y, cost_top, cost_bottom)
+            if shift_x is None or shift_y is None:
+                return None
+            return (repeated_x, repeated_y), shift_x + shift_y
+
+        def get_profile(x: int, y: int) -> List[List[int]]:
+            repeated = get_repeated(x, y)
+            if repeated is None or repeated[0] not in profiles:
+                return [[infinity] * len(side) for side in self._sides]
+            chunk, shift = repeated
+            return [[d + shift if d < infinity else infinity for d in side] for side in profiles[chunk]]
+
+        def get_fill(x: int, y: int) -> Optional[Tuple[int, ChunkFill]]:
+            repeated = get_repeated(x, y)
+            if repeated is None or repeated[0] not in fills:
+                return None
+            chunk, shift = repeated
+            minimum, fill = fills[chunk]
+            return minimum + shift, fill
+
+        # beyond `radius + period`, the neighbors of a chunk are the ones of the chunk `period` chunks closer, shifted
+        for x in range(-radius - period, radius + period + 1):
+            for y in range(-radius - period, radius + period + 1):
+                given = [[infinity] * len(side) for side in self._sides]
+                # the neighbor on a side exits through the side it is entered through from this chunk
+                for side, ((offset_x, offset_y), neighbor_side) in GardenChunkMemoization.NEIGHBORS.items():
+                    neighbor_fill = get_fill(x + offset_x, y + offset_y)
+                    if neighbor_fill is None:
+                        continue
+                    minimum, fill = neighbor_fill
+                    for i, exit_distance in enumerate(fill.exits[neighbor_side]):
+                        if exit_distance < infinity and not self._rocks[self._sides[side][i]]:
+                            given[side][i] = minimum + exit_distance + 1
+                if given != get_profile(x, y):
+                    return None
+
+        result = 0
+        for (x, y), (minimum, fill) in fills.items():
+            if max(abs(x), abs(y)) <= radius:
+                result += fill.count_reachable(steps - minimum)
+        repeated_coordinates = range(radius - period + 1, radius + 1)
+        for x, y, cost in [(-1, 0, cost_left), (1, 0, cost_right), (0, -1, cost_top), (0, 1, cost_bottom)]:
+            if cost is None:
+                continue
+            for c in repeated_coordinates:
+                for i in range(-radius, radius + 1):
+                    repeated = get_fill(x * c + abs(y) * i, y * c + abs(x) * i)
+                    if repeated is not None:
+                        minimum, fill = repeated
+                        result += fill.count_reachable_repeated(steps - minimum, cost)
+        for cost_x, cost_y, x, y in [
+            (cost_left, cost_top, -1, -1),
+            (cost_right, cost_top, 1, -1),
+            (cost_left, cost_bottom, -1, 1),
+            (cost_right, cost_bottom, 1, 1),
+        ]:
+            if cost_x is None or cost_y is None:
+                continue
+            for c_x in repeated_coordinates:
+                for c_y in repeated_coordinates:
+                    repeated = get_fill(x * c_x, y * c_y)
+                    if repeated is not None:
+                        minimum, fill = repeated
+                        steps_left = steps - minimum - cost_x
+                        while steps_left - cost_y >= 0:
+                            result += fill.count_reachable_repeated(steps_left, cost_y)
+                            steps_left -= cost_x
+        return result
+
+
 def part_1(
         file_name: str,
         steps: int,
@@ -239,6 +788,105 @@ def part_2(
     return result
 
 
+def part_1_frontier(
+        file_name: str,
+        steps: int,
+        expected_result: Optional[int] = None,
+) -> int:
+    result = GardenFrontierSearch(GardenMap(file_name), steps, infinite=False).run()
+    check_expectations(expected_result, result)
+    return result
+
+
+def part_1_bitmask(
+        file_name: str,
+        steps: int,
+        expected_result: Optional[int] = None,
+) -> int:
+    result = GardenBitmask(GardenMap(file_name)).run(steps)
+    check_expectations(expected_result, result)
+    return result
+
+
+def part_2_frontier(
+        file_name: str,
+        steps: int,
+        expected_result: Optional[int] = None,
+) -> int:
+    result = GardenFrontierSearch(GardenMap(file_name), steps, infinite=True).run()
+    check_expectations(expected_result, result)
+    return result
+
+
+def part_2_extrapolated(
+        file_name: str,
+        steps: int,
+        expected_result: Optional[int] = None,
+        max_periods: int = 30,
+        min_search_steps: int = 3000,
+) -> int:
+    result = GardenExtrapolation(GardenMap(file_name), max_periods, min_search_steps=min_search_steps).count(steps)
+    check_expectations(expected_result, result)
+    return result
+
+
+def part_2_chunk_memoization(
+        file_name: str,
+        steps: int,
+        expected_result: Optional[int] = None,
+) -> int:
+    search = GardenChunkMemoization(GardenMap(file_name))
+    result = search.count(steps)
+    print(f"{search.processed_chunks} chunks filled from {len(search.profile_cache)} distinct entry profiles")
+    check_expectations(expected_result, result)
+    return result
+
+
+def write_random_garden(file_name: str, width: int, height: int, rock_probability: float, seed: int) -> None:
+    generator = random.Random(seed)
+    rows = [
+        [
+            GardenTile.ROCK.value if generator.random() < rock_probability else GardenTile.EMPTY.value
+            for _ in range(width)
+        ]
+        for _ in range(height)
+    ]
+    rows[generator.randrange(height)][generator.randrange(width)] = GardenTile.START.value
+    with open(file_name, "w") as f:
+        for row in rows:
+            f.write("".join(row) + "\n")
+
+
+def compare_random_gardens(
+        count: int,
+        max_size: int,
+        steps: int,
+        engines: Dict[str, Callable[[GardenMap, int], int]],
+        seed: int = 21,
+) -> None:
+    """
+    Checks the general infinite garden engines against the frontier search on random small gardens,
+    which have none of the shortcuts of the puzzle inputs (clear rows and columns through the start, odd square size).
+    An engine may give up with a `ValueError`, which is counted, but it must never give a wrong count.
+    """
+    generator = random.Random(seed)
+    gave_up = {name: 0 for name in engines}
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(count):
+            file_name = os.path.join(directory, f"random-{i}.txt")
+            width, height = generator.randint(1, max_size), generator.randint(1, max_size)
+            rock_probability = generator.choice([0.1, 0.3, 0.5])
+            write_random_garden(file_name, width, height, rock_probability, generator.randrange(1 << 30))
+            garden = GardenMap(file_name)
+            expected = GardenFrontierSearch(garden, steps, infinite=True).run()
+            for name, engine in engines.items():
+                try:
+                    check_expectations(expected, engine(garden, steps))
+                except ValueError:
+                    gave_up[name] += 1
+    print(f"{count} random gardens up to {max_size}x{max_size} agree after {steps} steps, gave up: {gave_up}")
+
+
 """
 ###################
 ## SPOILER ALERT ##
@@ -331,3 +979,36 @@ if __name__ == '__main__':
     # print(part_2("example.txt", 1000, 668697))
     # print(part_2("example.txt", 5000, 16733044))
     print(part_2_optimized_for_particular_input("input.txt", 26501365, 621494544278648))
+
+    print(part_1_frontier("example.txt", 6, 16))
+    print(part_1_frontier("input.txt", 64, 3758))
+    print(part_1_bitmask("example.txt", 6, 16))
+    print(part_1_bitmask("input.txt", 64, 3758))
+    print(part_1_bitmask("input.txt", 1000, part_1_frontier("input.txt", 1000)))
+    print(part_2_frontier("example.txt", 6, 16))
+    print(part_2_frontier("example.txt", 10, 50))
+    print(part_2_frontier("example.txt", 50, 1594))
+    print(part_2_frontier("example.txt", 100, 6536))
+    print(part_2_frontier("example.txt", 500, 167004))
+    print(part_2_frontier("example.txt", 1000, 668697))
+    print(part_2_frontier("example.txt", 5000, 16733044))
+
+    for example_steps in [6, 10, 50, 100, 500, 1000, 5000]:
+        print(part_2_extrapolated("example.txt", example_steps, part_2_frontier("example.txt", example_steps)))
+    for example_steps in [500, 1000, 5000]:
+        # too few search steps to reach these, so they are extrapolated
+        print(part_2_extrapolated("example.txt", example_steps, part_2_frontier("example.txt", example_steps), 10, 0))
+    print(part_2_extrapolated("input.txt", 26501365, 621494544278648))
+
+    print(part_2_chunk_memoization("example.txt", 500, 167004))
+    print(part_2_chunk_memoization("example.txt", 1000, 668697))
+    print(part_2_chunk_memoization("example.txt", 5000, 16733044))
+    print(part_2_chunk_memoization("input.txt", 5000, part_2_frontier("input.txt", 5000)))
+    print(part_2_chunk_memoization("input.txt", 26501365, 621494544278648))
+
+    chunk_memoization = {"chunk memoization": lambda garden, steps: GardenChunkMemoization(garden).count(steps)}
+    compare_random_gardens(150, 7, 40, chunk_memoization)
+    compare_random_gardens(30, 12, 150, chunk_memoization)
+    compare_random_gardens(30, 7, 2501, {
+        "extrapolation": lambda garden, steps: GardenExtrapolation(garden, min_search_steps=1500).count(steps),
+    })
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import multiprocessing
+import multiprocessing.sharedctypes
+import os
+import tempfile
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional, Union, Dict, Set, Tuple, Callable, Iterable
-
-import networkx
-import matplotlib.pyplot as plt
+from functools import cached_property
+from typing import List, Optional, Union, Dict, Set, Tuple, Callable, Iterable, TextIO
 
 
 def check_expectations(expected, actual):
@@ -110,18 +112,29 @@ class TilesMap:
             self.end: end_crossroad,
         }
         start_tile = self.get_tile_from_coordinates(start_crossroad.coordinates)
-        for direction in start_tile.value.neighbor_directions:
-            self._find_pathways(start_crossroad, start_crossroad.coordinates + direction, crossroads)
+        # pathways to walk, as (from crossroad, first step coordinates); a stack instead of a recursion,
+        # so big mazes do not hit the recursion limit
+        to_walk: List[Tuple[Crossroad, Coordinates]] = [
+            (start_crossroad, start_crossroad.coordinates + direction)
+            for direction in start_tile.value.neighbor_directions
+        ]
+        to_walk.reverse()
+        while len(to_walk) > 0:
+            to_walk.extend(reversed(self._find_pathway(*to_walk.pop(), crossroads)))
         return Graph(start_crossroad, end_crossroad)
 
-    def _find_pathways(
+    def _find_pathway(
             self,
             from_crossroad: Crossroad,
             first_step_coordinates: Coordinates,
             crossroads: Dict[Coordinates, Crossroad]
-    ):
+    ) -> List[Tuple[Crossroad, Coordinates]]:
+        """
+        Walks a single pathway and registers it.
+        :return: The new pathways to walk from the crossroad the pathway leads to.
+        """
         if first_step_coordinates in from_crossroad.signpost:
-            return  # we already went this way from this crossroad
+            return []  # we already went this way from this crossroad
 
         previous_coordinates = from_crossroad.coordinates
         current_coordinates = first_step_coordinates
@@ -134,7 +147,7 @@ class TilesMap:
                 to_crossroad = crossroads[current_coordinates]
                 pathway = Pathway(from_crossroad, to_crossroad, length)
                 from_crossroad.signpost[first_step_coordinates] = pathway
-                return  # reached the end
+                return []  # reached the end
 
             next_directions = self.get_tile_from_coordinates(current_coordinates).value.neighbor_directions
             next_coordinates = [current_coordinates + direction for direction in next_directions]
@@ -147,7 +160,7 @@ class TilesMap:
                 next_usable_coordinates.append(c)
 
             if len(next_usable_coordinates) == 0:
-                return  # there is no way to go
+                return []  # there is no way to go
             if len(next_usable_coordinates) == 1:
                 previous_coordinates = current_coordinates
                 current_coordinates = next_usable_coordinates[0]
@@ -155,7 +168,7 @@ class TilesMap:
 
             # we are on a crossroad
             if current_coordinates == from_crossroad.coordinates:
-                return  # we returned to the crossroad where we started - no loops allowed
+                return []  # we returned to the crossroad where we started - no loops allowed
             if current_coordinates not in crossroads:
                 # register a new crossroad
                 crossroads[current_coordinates] = Crossroad(current_coordinates)
@@ -164,9 +177,7 @@ class TilesMap:
             from_crossroad.signpost[first_step_coordinates] = pathway
 
             # walk all the new pathways from this crossroad
-            for coordinates in next_usable_coordinates:
-                self._find_pathways(to_crossroad, coordinates, crossroads)
-            return
+            return [(to_crossroad, coordinates) for coordinates in next_usable_coordinates]
 
     def __str__(self) -> str:
         result = ""
@@ -224,28 +235,73 @@ class Graph:
         vertices: List[Crossroad] = []
 
         vertices_to_do = [self.start_crossroad]
+        seen_coordinates: Set[Coordinates] = {self.start_crossroad.coordinates}
         while len(vertices_to_do) > 0:
             crossroad = vertices_to_do.pop()
             vertices.append(crossroad)
             for pathway in crossroad.signpost.values():
                 edges.append(pathway)
                 other_crossroad = pathway.to_crossroad
-                if (other_crossroad in vertices) or (other_crossroad in vertices_to_do):
+                if other_crossroad.coordinates in seen_coordinates:
                     continue
+                seen_coordinates.add(other_crossroad.coordinates)
                 vertices_to_do.append(other_crossroad)
 
         return edges, vertices
 
+    def iterate_numbered(self) -> Iterable[Union[Tuple[str, int, Crossroad], Tuple[str, int, int, int]]]:
+        """
+        Walks the graph once, numbering the crossroads as they are first seen.
+        Yields ("vertex", id, crossroad) for every crossroad before any pathway uses it
+        and ("edge", from id, to id, length) for every pathway.
+        """
+        ids: Dict[Coordinates, int] = {self.start_crossroad.coordinates: 0}
+        yield "vertex", 0, self.start_crossroad
+        vertices_to_do = [self.start_crossroad]
+        while len(vertices_to_do) > 0:
+            crossroad = vertices_to_do.pop()
+            for pathway in crossroad.signpost.values():
+                other_crossroad = pathway.to_crossroad
+                if other_crossroad.coordinates not in ids:
+                    ids[other_crossroad.coordinates] = len(ids)
+                    yield "vertex", ids[other_crossroad.coordinates], other_crossroad
+                    vertices_to_do.append(other_crossroad)
+                yield "edge", ids[crossroad.coordinates], ids[other_crossroad.coordinates], pathway.length
+
+    def export(self, file_name: str, file_format: str = "dot") -> int:
+        """
+        Writes the graph in one streaming pass as "dot", "graphml" or "edgelist" (`from to length` lines).
+        :return: The number of edges written.
+        """
+        with open(file_name, "w") as f:
+            return self.write(f, file_format)
+
+    def write(self, f: TextIO, file_format: str = "dot") -> int:
+        if file_format not in GRAPH_EXPORT_FORMATS:
+            raise ValueError(f"Unexpected graph format '{file_format}'.")
+        header, vertex_template, edge_template, footer = GRAPH_EXPORT_FORMATS[file_format]
+        f.write(header)
+        edges = 0
+        for item in self.iterate_numbered():
+            if item[0] == "vertex":
+                _, vertex_id, crossroad = item
+                f.write(vertex_template.format(vertex_id, crossroad.coordinates.x, crossroad.coordinates.y))
+            else:
+                f.write(edge_template.format(*item[1:]))
+                edges += 1
+        f.write(footer)
+        return edges
+
     def visualize(self):
-        edges_list, vertices_list = self.get_edges_and_vertices()
+        # the drawing libraries are only needed here
+        import networkx
+        import matplotlib.pyplot as plt
 
         g = networkx.Graph()
-        for edge in edges_list:
-            g.add_edge(
-                vertices_list.index(edge.from_crossroad),
-                vertices_list.index(edge.to_crossroad),
-                weight=edge.length
-            )
+        for item in self.iterate_numbered():
+            if item[0] == "edge":
+                _, from_id, to_id, length = item
+                g.add_edge(from_id, to_id, weight=length)
 
         plt.figure(figsize=(10, 10))
         pos = networkx.spring_layout(g, seed=6)
@@ -257,6 +313,408 @@ class Graph:
         plt.show()
 
 
+GRAPH_EXPORT_FORMATS: Dict[str, Tuple[str, str, str, str]] = {  # header, vertex, edge, footer
+    "dot": (
+        "digraph hiking {\n",
+        '    {0} [label="{1},{2}"];\n',
+        "    {0} -> {1} [label={2}, weight={2}];\n",
+        "}\n",
+    ),
+    "graphml": (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+        '  <key id="x" for="node" attr.name="x" attr.type="int"/>\n'
+        '  <key id="y" for="node" attr.name="y" attr.type="int"/>\n'
+        '  <key id="length" for="edge" attr.name="length" attr.type="int"/>\n'
+        '  <graph id="hiking" edgedefault="directed">\n',
+        '    <node id="n{0}"><data key="x">{1}</data><data key="y">{2}</data></node>\n',
+        '    <edge source="n{0}" target="n{1}"><data key="length">{2}</data></edge>\n',
+        "  </graph>\n</graphml>\n",
+    ),
+    "edgelist": (
+        "",
+        "# {0} {1},{2}\n",
+        "{0} {1} {2}\n",
+        "",
+    ),
+}
+
+
+@dataclass
+class SearchStatistics:
+    expanded: int = 0  # crossroads the search stepped to
+    pruned_by_bound: int = 0  # branches cut because even the upper bound could not beat the longest path so far
+    pruned_by_last_crossroad: int = 0  # branches cut because the last crossroad before the end must go to the end
+
+
+@dataclass
+class FrontierStatistics:
+    widest_frontier: int = 0  # crossroads with both decided and undecided pathways
+    most_states: int = 0  # frontier states kept at once
+
+
+@dataclass(frozen=True)
+class IndexedGraph:
+    """
+    The crossroad graph with the crossroads interned to small ints (their index in `coordinates`).
+    `neighbors[i]` lists the (neighbor index, pathway length) pairs of the pathways leaving the i-th crossroad.
+    """
+    coordinates: List[Coordinates]
+    neighbors: List[List[Tuple[int, int]]]
+    start: int
+    end: int
+
+    @staticmethod
+    def from_graph(graph: Graph) -> IndexedGraph:
+        edges, vertices = graph.get_edges_and_vertices()
+        indices: Dict[Coordinates, int] = {crossroad.coordinates: i for i, crossroad in enumerate(vertices)}
+        neighbors: List[List[Tuple[int, int]]] = [[] for _ in vertices]
+        for edge in edges:
+            neighbors[indices[edge.from_crossroad.coordinates]].append(
+                (indices[edge.to_crossroad.coordinates], edge.length)
+            )
+        return IndexedGraph(
+            [crossroad.coordinates for crossroad in vertices],
+            neighbors,
+            indices[graph.start_crossroad.coordinates],
+            indices[graph.end_crossroad.coordinates],
+        )
+
+    def get_longest_path_length(self) -> Optional[int]:
+        """
+        DFS with the visited crossroads kept in a single int bitmask and the path length carried as a running total,
+        so nothing is allocated per visited path.
+        """
+        neighbors = self.neighbors
+        end = self.end
+        longest = -1
+
+        def walk(crossroad: int, visited: int, length: int) -> None:
+            nonlocal longest
+            if crossroad == end:
+                if length > longest:
+                    longest = length
+                return
+            for neighbor, pathway_length in neighbors[crossroad]:
+                if not visited & (1 << neighbor):
+                    walk(neighbor, visited | (1 << neighbor), length + pathway_length)
+
+        walk(self.start, 1 << self.start, 0)
+        return None if longest < 0 else longest
+
+    @cached_property
+    def _branch_and_bound_tables(self) -> Tuple[List[List[Tuple[int, int]]], List[int], Optional[int], int]:
+        """
+        :return: The neighbors sorted from the longest pathway, the longest pathway entering every crossroad,
+            the only crossroad the end can be entered from (if there is just one) and the length of that pathway.
+        """
+        neighbors = [sorted(pairs, key=lambda pair: -pair[1]) for pairs in self.neighbors]
+        longest_entry = [0] * len(neighbors)
+        entries_of_end: List[Tuple[int, int]] = []
+        for crossroad, pairs in enumerate(neighbors):
+            for neighbor, pathway_length in pairs:
+                longest_entry[neighbor] = max(longest_entry[neighbor], pathway_length)
+                if neighbor == self.end:
+                    entries_of_end.append((crossroad, pathway_length))
+        last_crossroad, last_pathway_length = entries_of_end[0] if len(entries_of_end) == 1 else (None, 0)
+        return neighbors, longest_entry, last_crossroad, last_pathway_length
+
+    def get_longest_path_length_branch_and_bound(
+            self,
+            statistics: Optional[SearchStatistics] = None,
+    ) -> Optional[int]:
+        """
+        The bitmask DFS with two cuts:
+        - The rest of the path enters every crossroad at most once, so it can not be longer than the sum
+          of the longest pathways entering the unvisited crossroads. Branches that can not beat the longest path
+          found so far even with this upper bound are pruned.
+        - If the end can only be entered from a single crossroad, the path has to go to the end once it gets there.
+        """
+        return self.get_longest_path_length_from(self.start, 1 << self.start, 0, statistics)
+
+    def get_longest_path_length_from(
+            self,
+            crossroad: int,
+            visited: int,
+            length: int,
+            statistics: Optional[SearchStatistics] = None,
+            shared_longest: Optional[multiprocessing.sharedctypes.Synchronized] = None,
+            refresh_every: int = 4096,
+    ) -> Optional[int]:
+        """
+        The branch-and-bound search continuing the path that is now on the `crossroad`.
+        With `shared_longest`, the longest path found so far is shared with other searches:
+        found paths are published there and the bound is checked against it every `refresh_every` expansions.
+        """
+        statistics = SearchStatistics() if statistics is None else statistics
+        neighbors, longest_entry, last_crossroad, last_pathway_length = self._branch_and_bound_tables
+        end = self.end
+        longest = -1  # the longest path found by this search
+        incumbent = -1 if shared_longest is None else shared_longest.value  # the longest path found by any search
+
+        def walk(crossroad: int, visited: int, length: int, bound: int) -> None:
+            nonlocal longest, incumbent
+            statistics.expanded += 1
+            if shared_longest is not None and statistics.expanded % refresh_every == 0:
+                incumbent = max(incumbent, shared_longest.value)
+            if crossroad == end:
+                if length > longest:
+                    longest = length
+                    if length > incumbent:
+                        incumbent = length
+                        if shared_longest is not None:
+                            with shared_longest.get_lock():
+                                shared_longest.value = max(shared_longest.value, length)
+                return
+            if crossroad == last_crossroad:
+                statistics.pruned_by_last_crossroad += sum(
+                    1 for neighbor, _ in neighbors[crossroad] if neighbor != end and not visited & (1 << neighbor)
+                )
+                walk(end, visited | (1 << end), length + last_pathway_length, bound - longest_entry[end])
+                return
+            for neighbor, pathway_length in neighbors[crossroad]:
+                if visited & (1 << neighbor):
+                    continue
+                if length + bound <= incumbent:
+                    statistics.pruned_by_bound += 1
+                    continue
+                walk(neighbor, visited | (1 << neighbor), length + pathway_length, bound - longest_entry[neighbor])
+
+        walk(crossroad, visited, length, sum(
+            entry for i, entry in enumerate(longest_entry) if not visited & (1 << i)
+        ))
+        return None if longest < 0 else longest
+
+    def get_prefixes(self, depth: int) -> List[Tuple[int, int, int]]:
+        """
+        :return: All the (crossroad, visited, length) states of the DFS after `depth` pathways,
+            and the states of the paths reaching the end sooner.
+        """
+        prefixes: List[Tuple[int, int, int]] = []
+
+        def walk(crossroad: int, visited: int, length: int, remaining_depth: int) -> None:
+            if crossroad == self.end or remaining_depth == 0:
+                prefixes.append((crossroad, visited, length))
+                return
+            for neighbor, pathway_length in self.neighbors[crossroad]:
+                if not visited & (1 << neighbor):
+                    walk(neighbor, visited | (1 << neighbor), length + pathway_length, remaining_depth - 1)
+
+        walk(self.start, 1 << self.start, 0, depth)
+        return prefixes
+
+    def get_two_way_pathways(self) -> List[Tuple[int, int, int]]:
+        """
+        :return: The pathways as (crossroad, crossroad, length) usable in both directions.
+            A pathway found from one of its crossroads only still counts once.
+        """
+        counts: Dict[Tuple[int, int, int], int] = dict()
+        for crossroad, pairs in enumerate(self.neighbors):
+            for neighbor, pathway_length in pairs:
+                counts[crossroad, neighbor, pathway_length] = counts.get((crossroad, neighbor, pathway_length), 0) + 1
+        pathways: List[Tuple[int, int, int]] = []
+        for (crossroad, neighbor, pathway_length), count in counts.items():
+            reverse_count = counts.get((neighbor, crossroad, pathway_length), 0)
+            if crossroad < neighbor or (crossroad > neighbor and reverse_count == 0):
+                pathways.extend([(crossroad, neighbor, pathway_length)] * max(count, reverse_count))
+        return pathways
+
+    def get_longest_path_length_frontier(self, statistics: Optional[FrontierStatistics] = None) -> Optional[int]:
+        """
+        Frontier-based dynamic programming (see doi.org-10.1016-j.dam.2011.08.010.pdf).
+        Decides pathway by pathway whether it is a part of the path. The crossroads are numbered in BFS order
+        and the pathways are decided in that order, so only a narrow frontier of crossroads
+        has both decided and undecided pathways.
+        The state is the connectivity of the path fragments on the frontier: for every frontier crossroad
+        on a fragment its mate - the other end of its fragment, or `interior` if the path already passes through it.
+        Only the longest length is kept for every state, so the run time is exponential in the frontier width
+        instead of in the number of paths.
+        The pathways are used as two-way, so it only fits the maps without slippery slopes.
+        :param statistics: If given, gets the widest frontier and the most states kept at once.
+        """
+        interior = -1
+        complete: Tuple = ("complete",)
+        pathways = self.get_two_way_pathways()
+        adjacency: List[List[int]] = [[] for _ in self.neighbors]
+        for crossroad, neighbor, _ in pathways:
+            adjacency[crossroad].append(neighbor)
+            adjacency[neighbor].append(crossroad)
+        order = [-1] * len(self.neighbors)
+        order[self.start] = 0
+        ordered = 1
+        to_do = [self.start]
+        while len(to_do) > 0:
+            next_to_do = []
+            for crossroad in to_do:
+                for neighbor in adjacency[crossroad]:
+                    if order[neighbor] < 0:
+                        order[neighbor] = ordered
+                        ordered += 1
+                        next_to_do.append(neighbor)
+            to_do = next_to_do
+        if order[self.end] < 0:
+            return None
+        pathways = [pathway for pathway in pathways if order[pathway[0]] >= 0]
+        pathways.sort(key=lambda p: (max(order[p[0]], order[p[1]]), min(order[p[0]], order[p[1]])))
+        first_pathway_index: Dict[int, int] = dict()
+        last_pathway_index: Dict[int, int] = dict()
+        for i, (crossroad, neighbor, _) in enumerate(pathways):
+            for c in (crossroad, neighbor):
+                first_pathway_index.setdefault(c, i)
+                last_pathway_index[c] = i
+        terminals = {self.start, self.end}
+        widest_frontier = 0
+        most_states = 0
+
+        states: Dict[Tuple, int] = {(): 0}  # sorted (crossroad, mate) pairs of the frontier crossroads on the path
+        for i, (crossroad, neighbor, pathway_length) in enumerate(pathways):
+            new_states: Dict[Tuple, int] = dict()
+
+            def keep(state: Tuple, length: int) -> None:
+                if new_states.get(state, -1) < length:
+                    new_states[state] = length
+
+            for state, length in states.items():
+                keep(state, length)  # the pathway is not used
+                if state is complete:
+                    continue  # nothing can be added to a complete path
+                mates = dict(state)
+                crossroad_mate = mates.get(crossroad, crossroad)
+                neighbor_mate = mates.get(neighbor, neighbor)
+                if interior in (crossroad_mate, neighbor_mate):
+                    continue  # a crossroad can not be passed twice
+                if any(c in mates and c in terminals for c in (crossroad, neighbor)):
+                    continue  # the path has to end in the start and the end
+                if crossroad_mate == neighbor:
+                    continue  # this would close a loop
+                for c in (crossroad, neighbor):
+                    mates[c] = interior if c in mates else c
+                for c, mate in ((crossroad_mate, neighbor_mate), (neighbor_mate, crossroad_mate)):
+                    if last_pathway_index[c] >= i:  # the start and the end may have left the frontier already
+                        mates[c] = mate
+                if {crossroad_mate, neighbor_mate} == terminals:
+                    if any(mate != interior for c, mate in mates.items() if c not in terminals):
+                        continue  # another fragment would stay disconnected
+                    keep(complete, length + pathway_length)
+                    continue
+                keep(tuple(sorted(mates.items())), length + pathway_length)
+
+            # drop the crossroads with no more undecided pathways from the frontier
+            leaving = {c for c in (crossroad, neighbor) if last_pathway_index[c] == i}
+            states = dict()
+            for state, length in new_states.items():
+                if state is not complete and len(leaving) > 0:
+                    mates = dict(state)
+                    if any(mates.get(c, c) not in (c, interior) and c not in terminals for c in leaving):
+                        continue  # a fragment would end in a crossroad that can not be extended anymore
+                    if any(c in terminals and c not in mates for c in leaving):
+                        continue  # the start or the end would stay off the path
+                    state = tuple((c, mate) for c, mate in state if c not in leaving)
+                if states.get(state, -1) < length:
+                    states[state] = length
+            widest_frontier = max(widest_frontier, sum(
+                1 for c in first_pathway_index if first_pathway_index[c] <= i < last_pathway_index[c]
+            ))
+            most_states = max(most_states, len(states))
+
+        if statistics is not None:
+            statistics.widest_frontier = widest_frontier
+            statistics.most_states = most_states
+        return states.get(complete)
+
+    def get_topological_order(self) -> Optional[List[int]]:
+        """
+        :return: The crossroads reachable from the start in a topological order of the pathways,
+            or None if the pathways reachable from the start contain a cycle.
+        """
+        reachable = [False] * len(self.neighbors)
+        reachable[self.start] = True
+        to_do = [self.start]
+        while len(to_do) > 0:
+            crossroad = to_do.pop()
+            for neighbor, _ in self.neighbors[crossroad]:
+                if not reachable[neighbor]:
+                    reachable[neighbor] = True
+                    to_do.append(neighbor)
+        entering = [0] * len(self.neighbors)
+        for crossroad, pairs in enumerate(self.neighbors):
+            if reachable[crossroad]:
+                for neighbor, _ in pairs:
+                    entering[neighbor] += 1
+        order: List[int] = []
+        to_do = [crossroad for crossroad, count in enumerate(entering) if reachable[crossroad] and count == 0]
+        while len(to_do) > 0:
+            crossroad = to_do.pop()
+            order.append(crossroad)
+            for neighbor, _ in self.neighbors[crossroad]:
+                entering[neighbor] -= 1
+                if entering[neighbor] == 0:
+                    to_do.append(neighbor)
+        if len(order) != sum(reachable):
+            return None
+        return order
+
+    def get_longest_path_length_dag(self) -> Optional[int]:
+        """
+        With slippery slopes, the pathways usually form a DAG. Then every path is simple and the longest one
+        comes from a single DP pass in a topological order, in O(V + E) no matter how many paths there are.
+        Falls back to the branch-and-bound search if there is a cycle.
+        """
+        order = self.get_topological_order()
+        if order is None:
+            return self.get_longest_path_length_branch_and_bound()
+        longest_to = [-1] * len(self.neighbors)
+        longest_to[self.start] = 0
+        for crossroad in order:
+            if longest_to[crossroad] < 0:
+                continue
+            for neighbor, pathway_length in self.neighbors[crossroad]:
+                longest_to[neighbor] = max(longest_to[neighbor], longest_to[crossroad] + pathway_length)
+        return None if longest_to[self.end] < 0 else longest_to[self.end]
+
+
+_worker_graph: Optional[IndexedGraph] = None
+_worker_shared_longest: Optional[multiprocessing.sharedctypes.Synchronized] = None
+
+
+def _initialize_worker(
+        graph: IndexedGraph,
+        shared_longest: Optional[multiprocessing.sharedctypes.Synchronized],
+) -> None:
+    global _worker_graph, _worker_shared_longest
+    _worker_graph = graph
+    _worker_shared_longest = shared_longest
+
+
+def _search_prefix(prefix: Tuple[int, int, int]) -> Tuple[Optional[int], SearchStatistics]:
+    statistics = SearchStatistics()
+    return _worker_graph.get_longest_path_length_from(*prefix, statistics, _worker_shared_longest), statistics
+
+
+def get_longest_path_length_parallel(
+        graph: IndexedGraph,
+        split_depth: int = 6,
+        processes: Optional[int] = None,
+        share_longest: bool = True,
+        statistics: Optional[SearchStatistics] = None,
+) -> Optional[int]:
+    """
+    Splits the search tree into the DFS prefixes of `split_depth` pathways and searches them in a process pool.
+    With `share_longest`, the workers share the longest path found so far to prune each other's branches.
+    """
+    statistics = SearchStatistics() if statistics is None else statistics
+    shared_longest = multiprocessing.Value("q", -1) if share_longest else None
+    longest: Optional[int] = None
+    with multiprocessing.Pool(processes, _initialize_worker, (graph, shared_longest)) as pool:
+        for prefix_longest, prefix_statistics in pool.imap_unordered(_search_prefix, graph.get_prefixes(split_depth)):
+            statistics.expanded += prefix_statistics.expanded
+            statistics.pruned_by_bound += prefix_statistics.pruned_by_bound
+            statistics.pruned_by_last_crossroad += prefix_statistics.pruned_by_last_crossroad
+            if prefix_longest is not None and (longest is None or prefix_longest > longest):
+                longest = prefix_longest
+    return longest
+
+
 def part_1(
         file_name: str,
         slippery: bool,
@@ -265,13 +723,156 @@ def part_1(
     hiking_map = TilesMap.parse(file_name, slippery)
     hiking_graph = hiking_map.get_graph()
     # hiking_graph.visualize()
+    # hiking_graph.export("graph.dot")
+    result = hiking_graph.get_longest_path_length()
+    check_expectations(expected_result, result)
+    return result
+
+
+def part_1_indexed(
+        file_name: str,
+        slippery: bool,
+        expected_result: Optional[int] = None,
+) -> int:
+    hiking_graph = IndexedGraph.from_graph(TilesMap.parse(file_name, slippery).get_graph())
     result = hiking_graph.get_longest_path_length()
     check_expectations(expected_result, result)
     return result
 
 
+def part_1_branch_and_bound(
+        file_name: str,
+        slippery: bool,
+        expected_result: Optional[int] = None,
+) -> int:
+    hiking_graph = IndexedGraph.from_graph(TilesMap.parse(file_name, slippery).get_graph())
+    statistics = SearchStatistics()
+    result = hiking_graph.get_longest_path_length_branch_and_bound(statistics)
+    print(statistics)
+    check_expectations(expected_result, result)
+    return result
+
+
+def part_1_parallel(
+        file_name: str,
+        slippery: bool,
+        split_depth: int = 6,
+        processes: Optional[int] = None,
+        share_longest: bool = True,
+        expected_result: Optional[int] = None,
+) -> int:
+    hiking_graph = IndexedGraph.from_graph(TilesMap.parse(file_name, slippery).get_graph())
+    statistics = SearchStatistics()
+    result = get_longest_path_length_parallel(hiking_graph, split_depth, processes, share_longest, statistics)
+    print(statistics)
+    check_expectations(expected_result, result)
+    return result
+
+
+def export_graph(
+        file_name: str,
+        slippery: bool,
+        export_file_name: str,
+        file_format: str = "dot",
+        expected_result: Optional[int] = None,
+) -> int:
+    result = TilesMap.parse(file_name, slippery).get_graph().export(export_file_name, file_format)
+    check_expectations(expected_result, result)
+    return result
+
+
+def part_1_dag(
+        file_name: str,
+        slippery: bool,
+        expected_result: Optional[int] = None,
+) -> int:
+    hiking_graph = IndexedGraph.from_graph(TilesMap.parse(file_name, slippery).get_graph())
+    result = hiking_graph.get_longest_path_length_dag()
+    check_expectations(expected_result, result)
+    return result
+
+
+def get_contracted_graph(hiking_map: TilesMap) -> IndexedGraph:
+    """
+    Builds the crossroad graph with `map_loader.contract_corridors` instead of `TilesMap.get_graph`.
+    The dead ends are kept as crossroads there, which does not change the longest path.
+    `map_loader` needs Python 3.12, so it is imported only here.
+    """
+    import coordinates as loader_coordinates
+    import map_loader
+
+    weighted_graph = map_loader.contract_corridors(
+        map_loader.Map(hiking_map._map),
+        lambda tile: tile.value.is_walkable,
+        lambda tile: [loader_coordinates.Direction(down=d.y, right=d.x) for d in tile.value.neighbor_directions],
+        keep=[loader_coordinates.Coordinates(from_top=c.y, from_left=c.x) for c in (hiking_map.start, hiking_map.end)],
+    )
+    coordinates = [Coordinates(vertex.from_left, vertex.from_top) for vertex in weighted_graph.vertices]
+    return IndexedGraph(
+        coordinates,
+        [list(weighted_graph.get_edges(vertex)) for vertex in range(weighted_graph.vertex_count)],
+        coordinates.index(hiking_map.start),
+        coordinates.index(hiking_map.end),
+    )
+
+
+def part_1_contracted(
+        file_name: str,
+        slippery: bool,
+        expected_result: Optional[int] = None,
+) -> int:
+    result = get_contracted_graph(TilesMap.parse(file_name, slippery)).get_longest_path_length_branch_and_bound()
+    check_expectations(expected_result, result)
+    return result
+
+
+def part_1_frontier(
+        file_name: str,
+        expected_result: Optional[int] = None,
+) -> int:
+    hiking_graph = IndexedGraph.from_graph(TilesMap.parse(file_name, False).get_graph())
+    statistics = FrontierStatistics()
+    result = hiking_graph.get_longest_path_length_frontier(statistics)
+    print(statistics)
+    check_expectations(expected_result, result)
+    return result
+
+
 if __name__ == '__main__':
     print(part_1("example.txt", True, 94))
     print(part_1("input.txt", True, 2430))
     print(part_1("example.txt", False, 154))
     print(part_1("input.txt", False, 6534))
+
+    print(part_1_indexed("example.txt", True, 94))
+    print(part_1_indexed("input.txt", True, 2430))
+    print(part_1_indexed("example.txt", False, 154))
+    print(part_1_indexed("input.txt", False, 6534))
+
+    print(part_1_branch_and_bound("example.txt", True, 94))
+    print(part_1_branch_and_bound("input.txt", True, 2430))
+    print(part_1_branch_and_bound("example.txt", False, 154))
+    print(part_1_branch_and_bound("input.txt", False, 6534))
+
+    print(part_1_parallel("example.txt", False, 3, expected_result=154))
+    print(part_1_parallel("input.txt", True, expected_result=2430))
+    print(part_1_parallel("input.txt", False, expected_result=6534))
+    print(part_1_parallel("input.txt", False, share_longest=False, expected_result=6534))
+
+    print(part_1_frontier("example.txt", 154))
+    print(part_1_frontier("input.txt", 6534))
+
+    print(part_1_dag("example.txt", True, 94))
+    print(part_1_dag("input.txt", True, 2430))
+    print(part_1_dag("example.txt", False, 154))
+
+    with tempfile.TemporaryDirectory() as export_directory:
+        for export_format in GRAPH_EXPORT_FORMATS:
+            export_file_name = os.path.join(export_directory, f"graph.{export_format}")
+            print(export_graph("input.txt", True, export_file_name, export_format, 60))
+            print(export_graph("input.txt", False, export_file_name, export_format, 119))
+
+    print(part_1_contracted("example.txt", True, 94))
+    print(part_1_contracted("input.txt", True, 2430))
+    print(part_1_contracted("example.txt", False, 154))
+    print(part_1_contracted("input.txt", False, 6534))
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from functools import cache
 
 from expectations_check import validate_result
+from memoization import memoize
 
 
 @dataclass(frozen=True)
@@ -70,7 +70,7 @@ def load_from_file(file_name: str) -> DevicesPile[ConnectedDevice]:
     return connected_devices
 
 
-@cache
+@memoize()  # cleared after each run, so it does not keep the loaded devices alive
 def count_paths(start_device: ConnectedDevice, target_device: ConnectedDevice) -> int:
     if target_device is start_device:
         return 1
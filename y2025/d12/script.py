@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import StrEnum
-from functools import cache, cached_property
+from functools import cached_property
 import re
 
 from coordinates import Coordinates, Direction
 from expectations_check import validate_result
 from map_loader import Map, Tile
+from memoization import memoize
 
 
 class TileValue(StrEnum):
@@ -117,7 +118,7 @@ class Present:
         )
 
 
-@cache
+@memoize(max_size=1024)
 def get_coordinates_of_shape(shape: PresentRotation) -> tuple[Coordinates, ...]:
     return tuple(
         Coordinates(from_top=row_index, from_left=col_index)
@@ -140,7 +141,6 @@ class RegionDefinition:
         return needed_size <= self.width * self.length
 
 
-@cache
 def sum_coordinates(shape_coordinates: Coordinates, offset: Direction) -> Coordinates:
     return shape_coordinates + offset
 